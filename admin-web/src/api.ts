@@ -14,6 +14,22 @@ async function request(path, options = {}) {
   return data;
 }
 
+// 목록 API(keyset 페이지)를 X-Next-Cursor 헤더가 없을 때까지 따라가며 모두 모음
+async function requestAllPages(path, pageSize = 500) {
+  const items = [];
+  let cursor = null;
+  do {
+    const sep = path.includes('?') ? '&' : '?';
+    const query = `limit=${pageSize}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+    const res = await fetch(`${API_BASE}${path}${sep}${query}`);
+    const data = await res.json().catch(() => null);
+    if (!res.ok) throw new Error(data?.detail || res.statusText || res.status);
+    items.push(...data);
+    cursor = res.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return items;
+}
+
 export const api = {
   airlines: {
     list: () => request('/api/airlines'),
@@ -45,7 +61,7 @@ export const api = {
     delete: (id) => request(`/api/keywords/${id}`, { method: 'DELETE' }),
   },
   notices: {
-    list: () => request('/api/notices'),
+    list: () => requestAllPages('/api/notices'),
     toggleDeal: (id, isSpecialDeal) => request(`/api/notices/${id}/toggle_deal`, {
       method: 'PUT',
       body: JSON.stringify({ is_special_deal: isSpecialDeal })
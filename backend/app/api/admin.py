@@ -4,12 +4,17 @@
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from app.config import settings
 from app.db import get_db
+from app.models.db_models import MonitorUrl
+from app.services import response_cache
+from app.services.crawler import fetch_html, fetch_tiers, seen_index
+from app.services.crawler.document import HtmlDocument
+from app.services.crawler.parser import REFERENCE_PARSER, make_soup, parser_backend
+from app.services.crawler.universal import extract_links_and_titles_from_list_page, selectors_for
+from app.services.http_client import get_http_client
 from app.services.pipeline import run_pipeline
 from app.services.price_crawler import update_deal_prices
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,16 +27,14 @@ async def get_site_info(url: str):
     """URL 페이지에서 title, favicon/og:image 추출 (항공사 추가 시 이름·로고 자동 채우기용)."""
     if not url.strip().startswith(("http://", "https://")):
         raise HTTPException(400, "Invalid URL")
-    timeout = getattr(settings, "http_timeout_seconds", 30.0)
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            r = await client.get(url)
-            r.raise_for_status()
+        r = await get_http_client().get(url)
+        r.raise_for_status()
     except httpx.HTTPError as e:
         raise HTTPException(502, f"Failed to fetch URL: {e!s}")
     parsed = urlparse(url)
     origin = f"{parsed.scheme}://{parsed.netloc}"
-    soup = BeautifulSoup(r.text, "html.parser")
+    soup = make_soup(r.text)
     title = ""
     if soup.title and soup.title.string:
         title = soup.title.string.strip()
@@ -52,6 +55,42 @@ async def get_site_info(url: str):
     return {"name": title, "logo_url": logo_url}
 
 
+@router.get("/fetch-tiers")
+async def get_fetch_tiers():
+    """호스트별로 학습된 수집 단계, 단계별 성공/실패 횟수와 평균 지연(ms)."""
+    return fetch_tiers.snapshot()
+
+
+@router.get("/parser-check/{url_id}")
+async def check_parser_backend(url_id: str, db: AsyncSession = Depends(get_db)):
+    """MonitorUrl 목록 페이지를 html.parser 와 현재 파서 백엔드로 각각 추출해 결과가 같은지 비교."""
+    row = await db.get(MonitorUrl, url_id)
+    if not row:
+        raise HTTPException(404, "Monitor URL not found")
+    if not (row.list_link_selector or "").strip():
+        raise HTTPException(400, "list_link_selector 가 없는 단일 페이지 URL입니다.")
+    html = await fetch_html(row.url)
+    if not html:
+        raise HTTPException(502, "Failed to fetch URL")
+
+    selectors = selectors_for(row)
+
+    def extract(parser: str) -> list[tuple[str, str, str | None]]:
+        return extract_links_and_titles_from_list_page(HtmlDocument(html, row.url, parser=parser), row.url, selectors)
+
+    backend = parser_backend()
+    reference = extract(REFERENCE_PARSER)
+    candidate = extract(backend)
+    return {
+        "backend": backend,
+        "match": reference == candidate,
+        "reference_count": len(reference),
+        "backend_count": len(candidate),
+        "only_in_reference": [list(x) for x in reference if x not in candidate],
+        "only_in_backend": [list(x) for x in candidate if x not in reference],
+    }
+
+
 @router.post("/crawl")
 async def trigger_crawl():
     """공지 감지 → 분석 → 푸시 파이프라인 수동 1회 실행."""
@@ -70,9 +109,14 @@ async def clear_crawled_data(db: AsyncSession = Depends(get_db)):
         await db.execute(delete(Notice))
         
         # Reset monitor urls so it triggers a fresh crawl next time
-        await db.execute(update(MonitorUrl).values(last_checked_at=None, last_html_hash=None))
+        await db.execute(update(MonitorUrl).values(
+            last_checked_at=None, last_html_hash=None, http_etag=None, http_last_modified=None,
+            pending_detail_items=None,
+        ))
         
         await db.commit()
+        seen_index.invalidate()
+        response_cache.bump_generation()
         return {"status": "ok", "message": "All crawled data (Notices, Deals) has been cleared."}
     except Exception as e:
         await db.rollback()
@@ -85,6 +129,9 @@ async def trigger_price_update(
 ):
     """price가 비어 있는 Deal에 대해 URL에서 가격 크롤링 후 저장."""
     updated = await update_deal_prices(db, deal_id=deal_id)
+    if updated:
+        await db.commit()
+        response_cache.bump_generation()
     return {"status": "ok", "updated_count": updated}
 
 
@@ -9,6 +9,10 @@ from app.db import get_db
 from app.models.db_models import Airline, MonitorUrl
 from app.schemas.airline import AirlineCreate, AirlineUpdate, AirlineResponse
 from app.schemas.monitor_url import MonitorUrlCreate, MonitorUrlResponse, MonitorUrlUpdate
+from app.services import response_cache
+from app.services.crawler import seen_index
+from app.services.crawler.universal import invalidate_selector_cache
+from app.services.keyword_matcher import invalidate_keywords
 
 router = APIRouter()
 
@@ -26,6 +30,8 @@ async def create_airline(body: AirlineCreate, db: AsyncSession = Depends(get_db)
         name=body.name,
         base_url=body.base_url,
         logo_url=body.logo_url,
+        crawl_rate_per_second=body.crawl_rate_per_second,
+        crawl_burst=body.crawl_burst,
     )
     db.add(airline)
     await db.flush()
@@ -56,8 +62,15 @@ async def update_airline(airline_id: str, body: AirlineUpdate, db: AsyncSession
         airline.base_url = body.base_url
     if body.logo_url is not None:
         airline.logo_url = body.logo_url
+    if body.crawl_rate_per_second is not None:
+        airline.crawl_rate_per_second = body.crawl_rate_per_second
+    if body.crawl_burst is not None:
+        airline.crawl_burst = body.crawl_burst
     await db.flush()
     await db.refresh(airline)
+    # 항공사명은 공지·특가 목록 응답에 포함
+    await db.commit()
+    response_cache.bump_generation()
     return airline
 
 
@@ -69,6 +82,10 @@ async def delete_airline(airline_id: str, db: AsyncSession = Depends(get_db)):
     if not airline:
         raise HTTPException(404, "Airline not found")
     await db.delete(airline)
+    await db.commit()
+    seen_index.invalidate(airline_id=airline_id)
+    invalidate_keywords(airline_id)
+    response_cache.bump_generation()
     return None
 
 
@@ -93,6 +110,7 @@ async def add_monitor_url(airline_id: str, body: MonitorUrlCreate, db: AsyncSess
         detail_title_selector=body.detail_title_selector,
         list_period_selector=body.list_period_selector,
         list_next_selector=body.list_next_selector,
+        hash_ignore_selector=body.hash_ignore_selector,
     )
     db.add(mu)
     await db.flush()
@@ -120,6 +138,12 @@ async def update_monitor_url(
         row.list_period_selector = body.list_period_selector
     if body.list_next_selector is not None:
         row.list_next_selector = body.list_next_selector
+    if body.hash_ignore_selector is not None:
+        row.hash_ignore_selector = body.hash_ignore_selector or None
+    # 선택자가 바뀌면 페이지가 그대로여도(304) 다시 파싱해야 하므로 조건부 요청 검증자 초기화
+    row.http_etag = None
+    row.http_last_modified = None
+    invalidate_selector_cache(row.id)
     await db.flush()
     await db.refresh(row)
     return row
@@ -133,6 +157,8 @@ async def delete_monitor_url(airline_id: str, url_id: str, db: AsyncSession = De
     if not row:
         raise HTTPException(404, "Monitor URL not found")
     await db.delete(row)
+    invalidate_selector_cache(row.id)
+    seen_index.invalidate(monitor_url_id=row.id)
     return None
 
 
@@ -158,8 +184,13 @@ async def delete_crawled_data(airline_id: str, db: AsyncSession = Depends(get_db
     await db.execute(
         update(MonitorUrl)
         .where(MonitorUrl.airline_id == airline_id)
-        .values(last_html_hash=None, last_checked_at=None)
+        .values(
+            last_html_hash=None, last_checked_at=None, http_etag=None, http_last_modified=None,
+            pending_detail_items=None,
+        )
     )
     
     await db.commit()
+    seen_index.invalidate(airline_id=airline_id)
+    response_cache.bump_generation()
     return None
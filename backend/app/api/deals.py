@@ -1,51 +1,119 @@
 """
 항공사 특가·이벤트 API (DB 연동)
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import DateTime, func, literal, literal_column, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.listing import (
+    cached_list_response,
+    decode_cursor,
+    decode_since,
+    encode_cursor,
+    fetch_limit,
+    page_limit,
+    paginate,
+    period_filters,
+)
+from app.config import settings
 from app.db import get_db
-from app.models.db_models import Deal, Airline
-from app.models.deal import DealResponse
+from app.models.db_models import Airline, Deal
+from app.models.deal import DealChangesResponse, DealResponse
+from app.services.sync import SyncCursorExpired, fetch_changes
 
 router = APIRouter()
+_RESPONSE_ADAPTER = TypeAdapter(list[DealResponse])
+
+
+def _sort_key(column):
+    # NULL 은 -infinity 로 두어 DESC 에서 맨 뒤 (migrations 의 ix_deals_sort 와 같은 식)
+    return func.coalesce(column, literal_column("'-infinity'::timestamptz"))
+
+
+def _list_select():
+    """특가 + 항공사명 (join 으로 같은 쿼리에서)."""
+    return select(Deal, Airline.name).join(Airline, Airline.id == Deal.airline_id)
+
+
+def _to_response(d: Deal, airline_name: str) -> DealResponse:
+    return DealResponse(
+        id=d.id,
+        airline=airline_name,
+        airline_id=d.airline_id,
+        title=d.title,
+        description=d.description,
+        url=d.url,
+        image_url=d.image_url,
+        event_start=d.event_start,
+        event_end=d.event_end,
+        routes=d.routes,
+        price=d.price,
+        created_at=d.created_at,
+    )
 
 
 @router.get("", response_model=list[DealResponse])
-async def get_deals(db: AsyncSession = Depends(get_db)):
-    """앱에서 조회: 국내 항공사 특가 이벤트 목록 (항공사명 포함)."""
-    try:
+async def get_deals(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    airline_id: str | None = Query(None, description="특정 항공사만"),
+    active: bool | None = Query(None, description="true: 아직 끝나지 않은 특가만, false: 끝난 특가만"),
+    route: str | None = Query(None, description="노선 (예: GMP-CJU)"),
+    date_from: date | None = Query(None, description="행사 기간이 이 날짜 이후와 겹치는 특가"),
+    date_to: date | None = Query(None, description="행사 기간이 이 날짜 이전과 겹치는 특가"),
+    limit: int | None = Query(None, ge=1, le=settings.api_max_page_size, description="한 페이지 건수. limit·cursor 가 없으면 전체"),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+):
+    """앱에서 조회: 국내 항공사 특가 이벤트 목록 (항공사명 포함).
+    행사 시작·종료 최신순(날짜 없는 것은 뒤). limit 또는 cursor 를 주면 keyset 페이지, 다음 페이지가 있으면 X-Next-Cursor 헤더.
+    응답은 데이터가 바뀔 때까지 캐시, ETag / If-None-Match 로 304."""
+    limit = page_limit(limit, cursor)
+    start_key, end_key = _sort_key(Deal.event_start), _sort_key(Deal.event_end)
+    conds = period_filters(Deal, active, route, date_from, date_to)
+    if airline_id is not None and airline_id.strip():
+        conds.append(Deal.airline_id == airline_id.strip())
+    if cursor:
+        event_start, event_end, deal_id = decode_cursor(cursor, ("datetime", "datetime", "str"))
+        conds.append(
+            tuple_(start_key, end_key, Deal.id)
+            < tuple_(_sort_key(literal(event_start, DateTime(timezone=True))),
+                     _sort_key(literal(event_end, DateTime(timezone=True))), deal_id)
+        )
+
+    async def load():
         q = (
-            select(Deal)
-            .options(selectinload(Deal.airline))
-            .join(Deal.airline)
-            .order_by(
-                Deal.event_start.desc().nulls_last(),
-                Deal.event_end.desc().nulls_last(),
-                Airline.name.asc()
-            )
+            _list_select()
+            .where(*conds)
+            # 같은 기간끼리는 id 순 (예전의 항공사명 순 대신: keyset 커서가 deals 컬럼만으로 결정되도록)
+            .order_by(start_key.desc(), end_key.desc(), Deal.id.desc())
+            .limit(fetch_limit(limit))
         )
         res = await db.execute(q)
-        deals = res.scalars().all()
-        return [
-            DealResponse(
-                id=d.id,
-                airline=d.airline.name,
-                airline_id=d.airline_id,
-                title=d.title,
-                description=d.description,
-                url=d.url,
-                image_url=d.image_url,
-                event_start=d.event_start,
-                event_end=d.event_end,
-                routes=d.routes,
-                price=d.price,
-                created_at=d.created_at,
-            )
-            for d in deals
-        ]
-    except SQLAlchemyError:
-        return []
+        rows, next_cursor = paginate(list(res.all()), limit, lambda r: [r[0].event_start, r[0].event_end, r[0].id])
+        return [_to_response(d, airline_name) for d, airline_name in rows], next_cursor
+
+    return await cached_list_response(request, _RESPONSE_ADAPTER, load)
+
+
+@router.get("/changes", response_model=DealChangesResponse)
+async def get_deal_changes(
+    db: AsyncSession = Depends(get_db),
+    since: str | None = Query(None, description="이전 응답의 cursor. 없으면 처음부터 (전체)"),
+    limit: int = Query(settings.api_page_size, ge=1, le=settings.api_max_page_size),
+):
+    """since 이후 추가·수정된 특가와 삭제된 특가 id (변경 순). has_more 면 cursor 로 바로 다시 요청.
+    since 가 보존 기간(sync_tombstone_retention_days)보다 오래되면 410 → 목록 전체를 다시 받은 뒤 since 없이 시작."""
+    since_key = decode_since(since)
+    try:
+        page = await fetch_changes(db, "deals", _list_select(), Deal.updated_at, Deal.id, since_key, limit)
+    except SyncCursorExpired:
+        raise HTTPException(status_code=410, detail="cursor 가 만료되었습니다. 전체 목록을 다시 받으세요.")
+    return DealChangesResponse(
+        changes=[_to_response(r[0], r[1]) for r in page.rows],
+        deleted=page.deleted,
+        cursor=encode_cursor(list(page.cursor)),
+        has_more=page.has_more,
+    )
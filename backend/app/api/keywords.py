@@ -1,5 +1,6 @@
 """
 키워드 CRUD (특가 판별용. airline_id 없으면 공통 키워드)
+키워드 추가 시 기존 공지 중 해당 키워드가 들어 있는 것만 백그라운드로 재분석 (진행률: GET /reanalysis)
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
@@ -8,6 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_db
 from app.models.db_models import Keyword
 from app.schemas.keyword import KeywordCreate, KeywordResponse
+from app.services.keyword_matcher import invalidate_keywords
+from app.services.reanalysis import get_job, get_jobs, start_reanalysis
 
 router = APIRouter()
 
@@ -27,9 +30,27 @@ async def create_keyword(body: KeywordCreate, db: AsyncSession = Depends(get_db)
     db.add(kw)
     await db.flush()
     await db.refresh(kw)
+    # 재분석 작업은 별도 세션에서 키워드를 다시 읽으므로 먼저 커밋
+    await db.commit()
+    invalidate_keywords(kw.airline_id)
+    start_reanalysis(kw.keyword, kw.airline_id)
     return kw
 
 
+@router.get("/reanalysis")
+async def list_reanalysis_jobs():
+    """키워드 추가로 시작된 재분석 작업들의 진행률 (최신 먼저)."""
+    return get_jobs()
+
+
+@router.get("/reanalysis/{job_id}")
+async def get_reanalysis_job(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(404, "Reanalysis job not found")
+    return job
+
+
 @router.delete("/{keyword_id}", status_code=204)
 async def delete_keyword(keyword_id: str, db: AsyncSession = Depends(get_db)):
     q = select(Keyword).where(Keyword.id == keyword_id)
@@ -38,4 +59,7 @@ async def delete_keyword(keyword_id: str, db: AsyncSession = Depends(get_db)):
     if not row:
         raise HTTPException(404, "Keyword not found")
     await db.delete(row)
+    # 커밋 전에 무효화하면 그 사이 다시 만든 자동자에 삭제된 키워드가 남음
+    await db.commit()
+    invalidate_keywords(row.airline_id)
     return None
@@ -0,0 +1,134 @@
+"""
+목록 API 공통 (/api/notices, /api/deals)
+- keyset 페이지: 응답 본문은 그대로 배열, 다음 페이지가 있으면 X-Next-Cursor 헤더에 커서
+  (limit·cursor 를 둘 다 주지 않으면 페이지 없이 전체 목록: 커서를 모르는 앱·PWA 용)
+  (커서 = 마지막 행의 정렬키를 JSON → base64url 로 감싼 값. 클라이언트는 그대로 ?cursor= 로 돌려줌)
+- 공통 필터: 진행 중(active), 노선(route), 기간 창(date_from ~ date_to)
+- 응답 캐시 + ETag (cached_list_response)
+"""
+import base64
+import json
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.services import response_cache
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    """정렬키 값 목록 → 커서 문자열. datetime 은 ISO 문자열로."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kinds: tuple[str, ...]) -> list:
+    """커서 문자열 → 정렬키 값 목록. kinds 는 값마다 "datetime" | "str" (datetime 은 None 허용)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("length")
+        out = []
+        for kind, v in zip(kinds, values):
+            if kind == "datetime":
+                out.append(None if v is None else datetime.fromisoformat(v))
+            elif isinstance(v, str):
+                out.append(v)
+            else:
+                raise ValueError(kind)
+        return out
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.") from None
+
+
+def decode_since(since: str | None) -> tuple[datetime, str] | None:
+    """/changes 의 since 커서 → (시각, id). 없으면 None."""
+    if not since:
+        return None
+    ts, row_id = decode_cursor(since, ("datetime", "str"))
+    if ts is None or ts.tzinfo is None:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.")
+    return ts, row_id
+
+
+def page_limit(limit: int | None, cursor: str | None) -> int | None:
+    """한 페이지 건수. limit·cursor 가 둘 다 없으면 None (전체 목록), cursor 만 있으면 api_page_size."""
+    if limit is None and not cursor:
+        return None
+    return limit or settings.api_page_size
+
+
+def fetch_limit(limit: int | None) -> int | None:
+    """조회할 행 수 (다음 페이지 유무 확인용 1건 추가). 전체 목록이면 None."""
+    return None if limit is None else limit + 1
+
+
+def paginate(rows: list, limit: int | None, key) -> tuple[list, str | None]:
+    """limit+1 건을 조회한 rows 에서 한 페이지만 남기고, 더 있으면 다음 커서도 반환. limit None 이면 전부."""
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(key(rows[-1]))
+    return rows, None
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def cached_list_response(request: Request, adapter: TypeAdapter, load) -> Response:
+    """load() -> (응답 모델 목록, 다음 커서) 결과를 경로·쿼리별로 캐시 (app/services/response_cache.py).
+    ETag 가 If-None-Match 와 같으면 본문 없이 304. DB 오류면 캐시하지 않고 빈 배열."""
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.current_generation()
+        try:
+            items, next_cursor = await load()
+        except SQLAlchemyError:
+            return JSONResponse([])
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        entry = response_cache.put(key, adapter.dump_json(items), headers, generation)
+    # no-cache: 브라우저·앱은 매번 If-None-Match 로 재검증
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def period_filters(
+    model,
+    active: bool | None = None,
+    route: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list:
+    """Notice / Deal 공통 조건. active: 아직 안 끝난 행 (끝 날짜 없으면 진행 중으로 봄),
+    route: "GMP-CJU" 가 routes 에 있는 행, date_from~date_to: 행사 기간이 이 창과 겹치는 행 (UTC 날짜)."""
+    conds = []
+    if active:
+        now = datetime.now(timezone.utc)
+        conds.append(or_(model.event_end >= now, model.event_end.is_(None)))
+    elif active is False:
+        conds.append(model.event_end < datetime.now(timezone.utc))
+    if route and route.strip():
+        conds.append(model.routes.contains([route.strip().upper()]))
+    if date_from is not None:
+        start = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+        conds.append(or_(model.event_end >= start, model.event_end.is_(None)))
+    if date_to is not None:
+        end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        conds.append(or_(model.event_start < end, model.event_start.is_(None)))
+    return conds
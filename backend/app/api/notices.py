@@ -1,74 +1,153 @@
 """
 크롤링된 전체 공지 API (이벤트만이 아닌 모든 공지)
 """
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.listing import (
+    cached_list_response,
+    decode_cursor,
+    decode_since,
+    encode_cursor,
+    fetch_limit,
+    page_limit,
+    paginate,
+    period_filters,
+)
+from app.config import settings
 from app.db import get_db
-from app.models.db_models import Notice
-from app.models.notice import NoticeResponse
+from app.models.db_models import Airline, Notice
+from app.models.notice import NoticeChangesResponse, NoticeResponse
+from app.services import response_cache
+from app.services.sync import SyncCursorExpired, fetch_changes
 
 router = APIRouter()
+_RESPONSE_ADAPTER = TypeAdapter(list[NoticeResponse])
+
+
+# 목록 제목에 필요한 만큼만 SQL 에서 잘라 옴 (raw_content·extracted_text 전체는 읽지 않음).
+# 100자 초과 여부를 알 수 있도록 한 글자 더
+_TITLE_LEN = 100
+# str.strip() 과 같은 공백 문자 집합
+_WHITESPACE = " \t\n\r\f\v\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+
+
+def _title_prefix_column():
+    return func.left(func.btrim(Notice.extracted_text, _WHITESPACE), _TITLE_LEN + 1).label("title_prefix")
 
 
-def _notice_title(notice: Notice, airline_name: str) -> str:
-    """공지 제목: extracted_text 앞 100자. 항공사명과 같으면 URL 경로로 대체."""
+def _notice_title(title_prefix: str | None, source_url: str | None, airline_name: str) -> str:
+    """공지 제목: extracted_text 앞 100자 (title_prefix = 앞뒤 공백 제거 후 101자). 항공사명과 같으면 URL 경로로 대체."""
     from urllib.parse import urlparse
 
     def _path_fallback() -> str:
-        parsed = urlparse(notice.source_url or "")
+        parsed = urlparse(source_url or "")
         path = (parsed.path or "").strip("/")
         if path:
             parts = path.split("/")
             return parts[-1] or path
         return "공지"
 
-    if notice.extracted_text and notice.extracted_text.strip():
-        s = notice.extracted_text.strip().replace("\n", " ")[:100]
-        out = s + ("..." if len(notice.extracted_text.strip()) > 100 else "")
+    if title_prefix:
+        s = title_prefix.replace("\n", " ")[:_TITLE_LEN]
+        out = s + ("..." if len(title_prefix) > _TITLE_LEN else "")
         if out != "공지" and out.strip() != (airline_name or "").strip():
             return out
     return _path_fallback()
 
 
+def _list_select():
+    """목록에 필요한 컬럼만 (항공사명은 join)."""
+    return select(
+        Notice.id,
+        Airline.name.label("airline_name"),
+        Notice.source_url,
+        _title_prefix_column(),
+        Notice.content_type,
+        Notice.event_start,
+        Notice.event_end,
+        Notice.is_special_deal,
+        Notice.created_at,
+    ).join(Airline, Airline.id == Notice.airline_id)
+
+
+def _to_response(n) -> NoticeResponse:
+    return NoticeResponse(
+        id=n.id,
+        airline=n.airline_name,
+        source_url=n.source_url,
+        title=_notice_title(n.title_prefix, n.source_url, n.airline_name),
+        content_type=n.content_type,
+        event_start=n.event_start,
+        event_end=n.event_end,
+        is_special_deal=n.is_special_deal,
+        created_at=n.created_at,
+    )
+
+
 @router.get("", response_model=list[NoticeResponse])
 async def get_notices(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     airline_id: str | None = Query(None, description="특정 항공사만"),
     is_special_deal: bool | None = Query(None, description="특가만"),
+    active: bool | None = Query(None, description="true: 아직 끝나지 않은 공지만, false: 끝난 공지만"),
+    route: str | None = Query(None, description="노선 (예: GMP-CJU)"),
+    date_from: date | None = Query(None, description="행사 기간이 이 날짜 이후와 겹치는 공지"),
+    date_to: date | None = Query(None, description="행사 기간이 이 날짜 이전과 겹치는 공지"),
+    limit: int | None = Query(None, ge=1, le=settings.api_max_page_size, description="한 페이지 건수. limit·cursor 가 없으면 전체"),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
 ):
-    """앱에서 조회: 크롤링된 공지 목록. airline_id / is_special_deal 로 필터 가능."""
-    try:
+    """앱에서 조회: 크롤링된 공지 목록 (최신순). limit 또는 cursor 를 주면 keyset 페이지, 다음 페이지가 있으면 X-Next-Cursor 헤더.
+    응답은 데이터가 바뀔 때까지 캐시, ETag / If-None-Match 로 304."""
+    limit = page_limit(limit, cursor)
+    conds = period_filters(Notice, active, route, date_from, date_to)
+    if airline_id is not None and airline_id.strip():
+        conds.append(Notice.airline_id == airline_id.strip())
+    if is_special_deal is True:
+        conds.append(Notice.is_special_deal == True)  # noqa: E712
+    if cursor:
+        created_at, notice_id = decode_cursor(cursor, ("datetime", "str"))
+        conds.append(tuple_(Notice.created_at, Notice.id) < tuple_(created_at, notice_id))
+
+    async def load():
         q = (
-            select(Notice)
-            .options(selectinload(Notice.airline))
-            .order_by(Notice.created_at.desc())
+            _list_select()
+            .where(*conds)
+            .order_by(Notice.created_at.desc(), Notice.id.desc())
+            .limit(fetch_limit(limit))
         )
-        if airline_id is not None and airline_id.strip():
-            q = q.where(Notice.airline_id == airline_id.strip())
-        if is_special_deal is True:
-            q = q.where(Notice.is_special_deal == True)  # noqa: E712
         res = await db.execute(q)
-        notices = res.scalars().all()
-        return [
-            NoticeResponse(
-                id=n.id,
-                airline=n.airline.name,
-                source_url=n.source_url,
-                title=_notice_title(n, n.airline.name if n.airline else ""),
-                content_type=n.content_type,
-                event_start=n.event_start,
-                event_end=n.event_end,
-                is_special_deal=n.is_special_deal,
-                created_at=n.created_at,
-            )
-            for n in notices
-        ]
-    except SQLAlchemyError:
-        return []
+        notices, next_cursor = paginate(list(res.all()), limit, lambda n: [n.created_at, n.id])
+        return [_to_response(n) for n in notices], next_cursor
+
+    return await cached_list_response(request, _RESPONSE_ADAPTER, load)
+
+
+@router.get("/changes", response_model=NoticeChangesResponse)
+async def get_notice_changes(
+    db: AsyncSession = Depends(get_db),
+    since: str | None = Query(None, description="이전 응답의 cursor. 없으면 처음부터 (전체)"),
+    limit: int = Query(settings.api_page_size, ge=1, le=settings.api_max_page_size),
+):
+    """since 이후 추가·수정된 공지와 삭제된 공지 id (변경 순). has_more 면 cursor 로 바로 다시 요청.
+    since 가 보존 기간(sync_tombstone_retention_days)보다 오래되면 410 → 목록 전체를 다시 받은 뒤 since 없이 시작."""
+    since_key = decode_since(since)
+    try:
+        page = await fetch_changes(db, "notices", _list_select(), Notice.updated_at, Notice.id, since_key, limit)
+    except SyncCursorExpired:
+        raise HTTPException(status_code=410, detail="cursor 가 만료되었습니다. 전체 목록을 다시 받으세요.")
+    return NoticeChangesResponse(
+        changes=[_to_response(n) for n in page.rows],
+        deleted=page.deleted,
+        cursor=encode_cursor(list(page.cursor)),
+        has_more=page.has_more,
+    )
+
 
 from pydantic import BaseModel
 
@@ -101,4 +180,5 @@ async def toggle_notice_special_deal(
             await db.delete(d)
             
     await db.commit()
+    response_cache.bump_generation()
     return {"status": "ok", "is_special_deal": notice.is_special_deal}
@@ -11,10 +11,71 @@ class Settings(BaseSettings):
     crawl_interval_seconds: int = 300
     http_timeout_seconds: int = 30
     cors_origins: str = "*"
+    # GET /api/notices, /api/deals 한 페이지 기본(cursor 만 줬을 때)·최대 건수. limit·cursor 가 없으면 전체 목록
+    api_page_size: int = 100
+    api_max_page_size: int = 500
+    # 목록 응답 캐시 (app/services/response_cache.py): 최대 항목 수 (0 이면 끔) / 데이터가 그대로여도 다시 조회하는 주기
+    api_cache_entries: int = 256
+    api_cache_ttl_seconds: int = 60
+    # /api/deals/changes, /api/notices/changes: 삭제 tombstone 보존 일수 (이보다 오래된 커서는 410 → 전체 다시 받기)
+    sync_tombstone_retention_days: int = 30
     host: str = "0.0.0.0"
     port: int = 8000
     firebase_credentials_path: str = "firebase-adminsdk.json"
     scraper_api_key: str | None = None
 
+    # 동시 크롤링: 전체 동시 MonitorUrl 수 / 같은 호스트 동시 MonitorUrl 수
+    crawl_concurrency: int = 4
+    crawl_per_host_concurrency: int = 1
+    # 목록에서 제목을 못 찾은 항목의 상세 페이지 동시 조회 수 / MonitorUrl 한 번 크롤링당 최대 조회 수
+    crawl_detail_concurrency: int = 4
+    crawl_detail_budget: int = 30
+    # 상세 조회가 이 횟수만큼 실패한 항목은 목록 제목(없으면 "공지")으로 저장하고 더 시도하지 않음
+    crawl_detail_max_attempts: int = 3
+    # 감지 → 분석 스트리밍: 분석 워커 수 / 감지가 앞서갈 수 있는 최대 대기 공지 수
+    analysis_concurrency: int = 2
+    analysis_queue_size: int = 100
+    # 키워드 추가 시 기존 공지 재분석: 한 번에 잠그고 분석·커밋하는 공지 수
+    reanalysis_batch_size: int = 200
+
+    # 호스트별 요청 속도 (token bucket). 항공사별 값은 Airline.crawl_rate_per_second / crawl_burst
+    crawl_rate_per_second: float = 1.0
+    crawl_burst: int = 3
+    scraperapi_rate_per_second: float = 2.0
+    scraperapi_burst: int = 5
+    crawl_rate_limit_retries: int = 2  # 429 재시도 횟수
+    crawl_max_retry_after_seconds: float = 120.0  # 이보다 긴 Retry-After 는 이번 사이클 포기
+
+    # 공용 HTTP 클라이언트 (app/services/http_client.py)
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_max_connections_per_host: int = 6
+    http_keepalive_expiry_seconds: float = 60.0
+    http_dns_cache_ttl_seconds: float = 300.0
+
+    # 헤드리스 브라우저 풀 (app/services/crawler/browser_pool.py)
+    browser_path: str = "/usr/bin/google-chrome"
+    browser_pool_size: int = 2
+    browser_max_navigations: int = 50
+    browser_acquire_timeout_seconds: float = 120.0
+    browser_wait_timeout_seconds: float = 20.0  # 페이지 준비 조건 최대 대기
+
+    # HTML 파서: html.parser | lxml | html5lib | auto(lxml 있으면 lxml). lxml 은 추출 결과 동일성을 확인한 뒤 켤 것
+    html_parser: str = "html.parser"
+    # HTML 파싱 프로세스 수. 0 이면 프로세스 풀 없이 같은 프로세스의 스레드에서 파싱
+    parse_workers: int = 0
+
+    # 단일 페이지 변경 감지: content(공지 영역 텍스트·링크 지문, 토큰/시각 등 잡음 무시) | raw(HTML 전체 hash)
+    single_page_fingerprint: str = "content"
+
+    # MonitorUrl 별로 메모리에 유지하는 최근 공지 URL 수 (이미 본 URL 판별용, 나머지는 DB 인덱스로 확인)
+    seen_index_window: int = 2000
+
+    # 호스트별 수집 단계 학습: 이 간격마다 더 싼 단계(httpx)부터 재시험
+    fetch_tier_reprobe_seconds: float = 21600.0
+    # curl 단계까지 연속 이 횟수만큼 차단된 호스트만 ScraperAPI(유료)·브라우저 단계로 올라감 (KNOWN_BLOCKED_HOSTS 는 처음부터)
+    fetch_tier_escalate_after: int = 3
+
 
 settings = Settings()
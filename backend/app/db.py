@@ -1,7 +1,6 @@
 """
 PostgreSQL 연결 및 세션
 """
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -38,75 +37,12 @@ async def get_db():
 
 
 async def init_db():
-    """테이블 생성 (앱 시작 시 호출) + 기존 DB에 logo_url 등 누락 컬럼 추가"""
+    """테이블 생성 (앱 시작 시 호출) + 아직 적용하지 않은 스키마 마이그레이션 (app/migrations.py)"""
     from app.models import db_models  # noqa: F401 - register tables
+    from app.migrations import lock_schema, run_migrations
+
+    # 여러 프로세스가 동시에 기동해도 한 곳에서만 생성·마이그레이션
     async with engine.begin() as conn:
+        await lock_schema(conn)
         await conn.run_sync(Base.metadata.create_all)
-    # 기존 airlines 테이블에 logo_url 없으면 추가 (create_all은 기존 테이블 수정 안 함)
-    async with engine.begin() as conn:
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'airlines' AND column_name = 'logo_url'
-                ) THEN
-                    ALTER TABLE airlines ADD COLUMN logo_url TEXT;
-                END IF;
-            END $$
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'monitor_urls' AND column_name = 'list_link_selector'
-                ) THEN
-                    ALTER TABLE monitor_urls ADD COLUMN list_link_selector TEXT;
-                END IF;
-            END $$
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'monitor_urls' AND column_name = 'detail_title_selector'
-                ) THEN
-                    ALTER TABLE monitor_urls ADD COLUMN detail_title_selector TEXT;
-                END IF;
-            END $$
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'monitor_urls' AND column_name = 'list_period_selector'
-                ) THEN
-                    ALTER TABLE monitor_urls ADD COLUMN list_period_selector TEXT;
-                END IF;
-            END $$
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'airlines' AND column_name = 'crawler_slug'
-                ) THEN
-                    ALTER TABLE airlines ADD COLUMN crawler_slug TEXT;
-                END IF;
-            END $$
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'monitor_urls' AND column_name = 'list_next_selector'
-                ) THEN
-                    ALTER TABLE monitor_urls ADD COLUMN list_next_selector TEXT;
-                END IF;
-            END $$
-        """))
\ No newline at end of file
+        await run_migrations(conn)
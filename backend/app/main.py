@@ -12,9 +12,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import admin, airlines, deals, keywords, notices
+from app.api.listing import NEXT_CURSOR_HEADER
 from app.config import settings as app_settings
 from app.db import init_db
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.crawler.browser_pool import close_browser_pool
+from app.services.crawler.parse_pool import close_parse_pool, init_parse_pool
+from app.services.http_client import close_http_clients, init_http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +35,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
 
+    await init_http_clients()
+    init_parse_pool()
+
     try:
         await init_db()
         start_scheduler()
@@ -38,6 +45,9 @@ async def lifespan(app: FastAPI):
         logger.warning("DB 연결 실패로 DB/스케줄러 없이 시작합니다. PostgreSQL 설치·실행 후 재시작하세요: %s", e)
     yield
     stop_scheduler()
+    await close_http_clients()
+    await close_browser_pool()
+    close_parse_pool()
 
 
 app = FastAPI(
@@ -53,6 +63,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(deals.router, prefix="/api/deals", tags=["deals"])
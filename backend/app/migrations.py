@@ -0,0 +1,202 @@
+"""
+버전 관리 스키마 마이그레이션 (init_db 에서 create_all 다음에 실행)
+- 적용한 버전은 schema_migrations 테이블에 기록하고, 다음 기동부터는 건너뜀
+- 여러 프로세스가 동시에 기동해도 advisory lock 으로 한 곳에서만 적용
+- 새 변경은 MIGRATIONS 끝에 다음 버전 번호로 추가 (이미 배포된 항목은 수정하지 않음)
+- 모든 문은 재실행해도 안전하게 작성 (schema_migrations 도입 전 init_db 가 이미 적용한 DB 대비)
+"""
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock 키 ("AERO")
+_LOCK_KEY = 0x4145524F
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+    # True 면 실패해도 기동을 막지 않음 (기록하지 않으므로 다음 기동 때 다시 시도)
+    optional: bool = False
+
+
+# Migration 2 정리 단계 조건: 유니크 인덱스가 아직 없는(= 도입 전) DB 에서만
+_NO_SOURCE_URL_INDEX = (
+    "NOT EXISTS (SELECT 1 FROM pg_indexes "
+    "WHERE schemaname = 'public' AND indexname = 'uq_notices_airline_source_url')"
+)
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "add_missing_columns", (
+        # create_all 은 기존 테이블에 컬럼을 추가하지 않음
+        "ALTER TABLE airlines ADD COLUMN IF NOT EXISTS logo_url TEXT",
+        "ALTER TABLE airlines ADD COLUMN IF NOT EXISTS crawler_slug TEXT",
+        "ALTER TABLE airlines ADD COLUMN IF NOT EXISTS crawl_rate_per_second DOUBLE PRECISION",
+        "ALTER TABLE airlines ADD COLUMN IF NOT EXISTS crawl_burst INTEGER",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS list_link_selector TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS detail_title_selector TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS list_period_selector TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS list_next_selector TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS http_etag TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS http_last_modified TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS hash_ignore_selector TEXT",
+        "ALTER TABLE monitor_urls ADD COLUMN IF NOT EXISTS pending_detail_items JSONB",
+        "ALTER TABLE notices ADD COLUMN IF NOT EXISTS fingerprint TEXT",
+    )),
+    Migration(2, "notices_unique_source_url", (
+        # 기존 단일 페이지 공지는 id 로 지문을 채워 구분하고, 목록 공지 중복은 가장 오래된 것만 남김
+        # (새 DB 는 create_all 이 인덱스를 이미 만들었으므로 정리 단계 생략)
+        "UPDATE notices n SET fingerprint = 'legacy:' || n.id "
+        "FROM monitor_urls m "
+        "WHERE n.fingerprint IS NULL AND m.airline_id = n.airline_id AND m.url = n.source_url "
+        "  AND COALESCE(m.list_link_selector, '') = '' "
+        f"  AND {_NO_SOURCE_URL_INDEX}",
+        # 결과 행은 run_migrations 가 로그로 남김 (삭제한 중복 공지 수)
+        "WITH removed AS ("
+        "  DELETE FROM notices n USING notices o "
+        "  WHERE n.fingerprint IS NULL AND o.fingerprint IS NULL "
+        "    AND n.airline_id = o.airline_id AND n.source_url = o.source_url "
+        "    AND (o.created_at, o.id) < (n.created_at, n.id) "
+        f"    AND {_NO_SOURCE_URL_INDEX} "
+        "  RETURNING 1"
+        ") SELECT count(*) AS removed_duplicate_notices FROM removed",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_notices_airline_source_url "
+        "ON notices (airline_id, source_url) WHERE fingerprint IS NULL",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_notices_airline_source_url_fingerprint "
+        "ON notices (airline_id, source_url, fingerprint)",
+        "DROP INDEX IF EXISTS ix_notices_airline_source_url",
+    )),
+    Migration(3, "query_indexes", (
+        # api/notices.py 목록: created_at DESC (+ 항공사 / 특가 필터). id 는 같은 시각 정렬용
+        # (crawler 의 airline_id + source_url 조회는 uq_notices_airline_source_url_fingerprint 가 담당)
+        "CREATE INDEX IF NOT EXISTS ix_notices_created_at ON notices (created_at DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_notices_airline_created_at "
+        "ON notices (airline_id, created_at DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_notices_special_created_at "
+        "ON notices (created_at DESC, id DESC) WHERE is_special_deal",
+        # api/deals.py keyset 정렬키 (NULL 은 -infinity 로 두어 DESC 에서 맨 뒤) + 항공사 필터용.
+        # ix_deals_airline_sort 는 항공사 데이터 삭제(FK)의 airline_id 조회도 담당
+        "CREATE INDEX IF NOT EXISTS ix_deals_sort ON deals ("
+        "(coalesce(event_start, '-infinity'::timestamptz)) DESC, "
+        "(coalesce(event_end, '-infinity'::timestamptz)) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_deals_airline_sort ON deals (airline_id, "
+        "(coalesce(event_start, '-infinity'::timestamptz)) DESC, "
+        "(coalesce(event_end, '-infinity'::timestamptz)) DESC, id DESC)",
+        # 공지 특가 토글·push_notice_to_deal 의 notice_id 조회
+        "CREATE INDEX IF NOT EXISTS ix_deals_notice_id ON deals (notice_id)",
+        # price_crawler: 가격이 아직 없는 특가
+        "CREATE INDEX IF NOT EXISTS ix_deals_price_pending ON deals (id) WHERE price IS NULL",
+        # 크롤러·키워드 매처의 항공사별 조회
+        "CREATE INDEX IF NOT EXISTS ix_monitor_urls_airline_id ON monitor_urls (airline_id)",
+        "CREATE INDEX IF NOT EXISTS ix_keywords_airline_id ON keywords (airline_id)",
+        "ANALYZE notices",
+        "ANALYZE deals",
+    )),
+    Migration(4, "notices_text_trgm", (
+        # 키워드 재분석 후보 조회용 트라이그램 인덱스 (pg_trgm 을 쓸 수 없으면 인덱스 없이 동작).
+        # 트라이그램은 3글자 단위라 2글자 키워드(특가, 할인 등)의 ILIKE 는 이 인덱스를 못 쓰고 순차 조회
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_notices_text_trgm ON notices "
+        "USING gin ((coalesce(extracted_text, raw_content)) gin_trgm_ops)",
+    ), optional=True),
+    Migration(5, "list_keyset_filter_indexes", (
+        # 진행 중(active)·기간 필터, 노선 필터 (routes @> '["GMP-CJU"]')
+        "CREATE INDEX IF NOT EXISTS ix_deals_event_end ON deals (event_end)",
+        "CREATE INDEX IF NOT EXISTS ix_notices_event_end ON notices (event_end)",
+        "CREATE INDEX IF NOT EXISTS ix_deals_routes ON deals USING gin (routes jsonb_path_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_notices_routes ON notices USING gin (routes jsonb_path_ops)",
+        "ANALYZE notices",
+        "ANALYZE deals",
+    )),
+    Migration(6, "change_tracking", (
+        # 변경 동기화 (app/services/sync.py): updated_at 은 트리거가 INSERT/UPDATE 마다 갱신 (대량 UPDATE 포함)
+        "ALTER TABLE notices ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ",
+        "UPDATE notices SET updated_at = coalesce(analyzed_at, created_at, clock_timestamp()) WHERE updated_at IS NULL",
+        "ALTER TABLE notices ALTER COLUMN updated_at SET DEFAULT clock_timestamp()",
+        "ALTER TABLE notices ALTER COLUMN updated_at SET NOT NULL",
+        "UPDATE deals SET updated_at = coalesce(created_at, clock_timestamp()) WHERE updated_at IS NULL",
+        "ALTER TABLE deals ALTER COLUMN updated_at SET DEFAULT clock_timestamp()",
+        """
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := clock_timestamp();
+            RETURN NEW;
+        END $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_notices_touch_updated_at ON notices",
+        "CREATE TRIGGER trg_notices_touch_updated_at BEFORE INSERT OR UPDATE ON notices "
+        "FOR EACH ROW EXECUTE FUNCTION touch_updated_at()",
+        "DROP TRIGGER IF EXISTS trg_deals_touch_updated_at ON deals",
+        "CREATE TRIGGER trg_deals_touch_updated_at BEFORE INSERT OR UPDATE ON deals "
+        "FOR EACH ROW EXECUTE FUNCTION touch_updated_at()",
+        # 삭제는 tombstone 으로 (항공사 삭제 CASCADE, 데이터 초기화 같은 대량 DELETE 도 문장 단위로 한 번에 기록)
+        "CREATE TABLE IF NOT EXISTS deletion_log ("
+        "id BIGSERIAL PRIMARY KEY, table_name TEXT NOT NULL, row_id TEXT NOT NULL, "
+        "deleted_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp())",
+        """
+        CREATE OR REPLACE FUNCTION log_deletions() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO deletion_log (table_name, row_id) SELECT TG_TABLE_NAME, id FROM old_rows;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_notices_log_deletions ON notices",
+        "CREATE TRIGGER trg_notices_log_deletions AFTER DELETE ON notices "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION log_deletions()",
+        "DROP TRIGGER IF EXISTS trg_deals_log_deletions ON deals",
+        "CREATE TRIGGER trg_deals_log_deletions AFTER DELETE ON deals "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION log_deletions()",
+        # /changes 커서 (updated_at, id) / (deleted_at, row_id) 순 조회, 보존 기간 정리
+        "CREATE INDEX IF NOT EXISTS ix_notices_updated_at ON notices (updated_at, id COLLATE \"C\")",
+        "CREATE INDEX IF NOT EXISTS ix_deals_updated_at ON deals (updated_at, id COLLATE \"C\")",
+        "CREATE INDEX IF NOT EXISTS ix_deletion_log_table_deleted_at "
+        "ON deletion_log (table_name, deleted_at, row_id COLLATE \"C\")",
+        "CREATE INDEX IF NOT EXISTS ix_deletion_log_deleted_at ON deletion_log (deleted_at)",
+    )),
+)
+
+
+async def lock_schema(conn: AsyncConnection) -> None:
+    """트랜잭션이 끝날 때까지 스키마 변경 잠금 (같은 트랜잭션에서 여러 번 호출해도 됨)."""
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+
+
+async def run_migrations(conn: AsyncConnection) -> list[int]:
+    """아직 적용하지 않은 마이그레이션을 버전 순으로 적용 (conn 의 트랜잭션 안에서). 이번에 적용한 버전 목록 반환."""
+    applied_now: list[int] = []
+    await lock_schema(conn)
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+        "applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    res = await conn.execute(text("SELECT version FROM schema_migrations"))
+    done = {row[0] for row in res}
+    for m in sorted(MIGRATIONS, key=lambda m: m.version):
+        if m.version in done:
+            continue
+        try:
+            async with conn.begin_nested():
+                for stmt in m.statements:
+                    res = await conn.execute(text(stmt))
+                    if res.returns_rows:
+                        for row in res.mappings():
+                            logger.info("마이그레이션 %d(%s): %s", m.version, m.name, dict(row))
+                await conn.execute(
+                    text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                    {"v": m.version, "n": m.name},
+                )
+        except Exception as e:
+            if not m.optional:
+                raise
+            logger.warning("마이그레이션 %d(%s) 생략, 다음 기동 때 다시 시도: %s", m.version, m.name, e)
+            continue
+        applied_now.append(m.version)
+        logger.info("마이그레이션 %d(%s) 적용", m.version, m.name)
+    return applied_now
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, Text, Boolean
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Integer, Numeric, Text, Boolean, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,8 @@ class Airline(Base):
     name: Mapped[str] = mapped_column(Text, nullable=False)
     base_url: Mapped[str] = mapped_column(Text, nullable=False)
     logo_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    crawl_rate_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)  # 호스트당 초당 요청 수 (없으면 기본값)
+    crawl_burst: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 연속 허용 요청 수 (없으면 기본값)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     monitor_urls: Mapped[list["MonitorUrl"]] = relationship(back_populates="airline", cascade="all, delete-orphan")
@@ -56,6 +58,10 @@ class MonitorUrl(Base):
     detail_title_selector: Mapped[str | None] = mapped_column(Text, nullable=True)  # 상세 페이지에서 제목 선택자 (없으면 title/og:title/h1)
     list_period_selector: Mapped[str | None] = mapped_column(Text, nullable=True)  # 목록 페이지에서 기간 텍스트 선택자
     list_next_selector: Mapped[str | None] = mapped_column(Text, nullable=True)  # 다음 페이지 버튼 선택자
+    http_etag: Mapped[str | None] = mapped_column(Text, nullable=True)  # 마지막 응답 ETag (If-None-Match)
+    http_last_modified: Mapped[str | None] = mapped_column(Text, nullable=True)  # 마지막 응답 Last-Modified (If-Modified-Since)
+    hash_ignore_selector: Mapped[str | None] = mapped_column(Text, nullable=True)  # 단일 페이지 지문에서 제외할 영역 선택자 (롤링 배너 등)
+    pending_detail_items: Mapped[list | None] = mapped_column(JSONB, nullable=True)  # 상세 제목을 아직 못 구한 목록 항목 [[URL, 기간 텍스트, 실패 횟수], ...]
 
     airline: Mapped["Airline"] = relationship("Airline", back_populates="monitor_urls")
 
@@ -63,10 +69,20 @@ class MonitorUrl(Base):
 class Notice(Base):
     """감지된 공지 (hash 변경 시 생성). 분석 후 특가면 Deal로 푸시."""
     __tablename__ = "notices"
+    __table_args__ = (
+        # 목록→상세 공지: 항공사별 URL 하나에 공지 하나 (겹친 크롤링의 중복 INSERT 방지)
+        Index(
+            "uq_notices_airline_source_url", "airline_id", "source_url",
+            unique=True, postgresql_where=text("fingerprint IS NULL"),
+        ),
+        # 단일 페이지 공지: 같은 URL이라도 내용(지문)이 다르면 새 공지. 이미 수집한 URL 확인(seen_index)에도 사용
+        Index("uq_notices_airline_source_url_fingerprint", "airline_id", "source_url", "fingerprint", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(Text, primary_key=True, default=gen_uuid)
     airline_id: Mapped[str] = mapped_column(Text, ForeignKey("airlines.id", ondelete="CASCADE"), nullable=False)
     source_url: Mapped[str] = mapped_column(Text, nullable=False)
+    fingerprint: Mapped[str | None] = mapped_column(Text, nullable=True)  # 단일 페이지 공지의 내용 지문 (목록→상세 공지는 NULL)
     content_type: Mapped[str] = mapped_column(Text, nullable=False)  # "text" | "image"
     raw_content: Mapped[str | None] = mapped_column(Text, nullable=True)  # HTML 조각 또는 이미지 URL/base64
     extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -76,6 +92,8 @@ class Notice(Base):
     is_special_deal: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     analyzed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # INSERT/UPDATE 마다 DB 트리거가 갱신 (변경 동기화 커서, app/services/sync.py)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("clock_timestamp()"))
 
     airline: Mapped["Airline"] = relationship("Airline", back_populates="notices")
 
@@ -99,3 +117,13 @@ class Deal(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
     airline: Mapped["Airline"] = relationship("Airline", back_populates="deals")
+
+
+class DeletionLog(Base):
+    """삭제된 공지·특가 id (변경 동기화 tombstone). notices/deals 의 DELETE 트리거가 기록, 보존 기간 뒤 정리."""
+    __tablename__ = "deletion_log"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(Text, nullable=False)  # "notices" | "deals"
+    row_id: Mapped[str] = mapped_column(Text, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("clock_timestamp()"))
@@ -23,3 +23,12 @@ class DealResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class DealChangesResponse(BaseModel):
+    """변경 동기화 한 페이지 (GET /changes)"""
+
+    changes: list[DealResponse]  # since 이후 추가·수정된 특가 (변경 순)
+    deleted: list[str]  # since 이후 삭제된 특가 id (tombstone)
+    cursor: str  # 다음 요청의 since
+    has_more: bool  # true 면 cursor 로 바로 이어서 요청
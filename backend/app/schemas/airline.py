@@ -1,16 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AirlineCreate(BaseModel):
     name: str
     base_url: str
     logo_url: str | None = None
+    crawl_rate_per_second: float | None = Field(default=None, gt=0)  # 크롤링 속도 제한 (없으면 기본값)
+    crawl_burst: int | None = Field(default=None, gt=0)
 
 
 class AirlineUpdate(BaseModel):
     name: str | None = None
     base_url: str | None = None
     logo_url: str | None = None
+    crawl_rate_per_second: float | None = Field(default=None, gt=0)
+    crawl_burst: int | None = Field(default=None, gt=0)
 
 
 class AirlineResponse(BaseModel):
@@ -18,5 +22,7 @@ class AirlineResponse(BaseModel):
     name: str
     base_url: str
     logo_url: str | None = None
+    crawl_rate_per_second: float | None = None
+    crawl_burst: int | None = None
 
     model_config = {"from_attributes": True}
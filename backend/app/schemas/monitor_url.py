@@ -8,6 +8,7 @@ class MonitorUrlCreate(BaseModel):
     detail_title_selector: str  # 상세 페이지에서 제목 선택자
     list_period_selector: str | None = None  # 목록 페이지에서 기간 선택자
     list_next_selector: str | None = None  # 다음 페이지 버튼 선택자
+    hash_ignore_selector: str | None = None  # 단일 페이지 변경 감지에서 제외할 영역 (롤링 배너 등)
 
 
 class MonitorUrlUpdate(BaseModel):
@@ -15,6 +16,7 @@ class MonitorUrlUpdate(BaseModel):
     detail_title_selector: str | None = None
     list_period_selector: str | None = None
     list_next_selector: str | None = None
+    hash_ignore_selector: str | None = None
 
 
 class MonitorUrlResponse(BaseModel):
@@ -26,5 +28,6 @@ class MonitorUrlResponse(BaseModel):
     detail_title_selector: str | None = None
     list_period_selector: str | None = None
     list_next_selector: str | None = None
+    hash_ignore_selector: str | None = None
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,133 @@
+"""
+노선 추출용 공항/도시 사전 (국내 LCC 취항지 위주).
+(IATA 코드, 한국어 이름들, 영어 이름들). 공항이 여럿인 도시 이름은 IATA 도시 코드(SEL, TYO, OSA 등)로 정규화.
+새 취항지는 여기에만 추가하면 app/services/routes.py 매처에 반영됨.
+"""
+
+AIRPORTS: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = (
+    # 국내
+    ("SEL", ("서울",), ("Seoul",)),
+    ("ICN", ("인천",), ("Incheon",)),
+    ("GMP", ("김포",), ("Gimpo",)),
+    ("CJU", ("제주",), ("Jeju",)),
+    ("PUS", ("부산", "김해"), ("Busan", "Gimhae")),
+    ("TAE", ("대구",), ("Daegu",)),
+    ("KWJ", ("광주",), ("Gwangju",)),
+    ("CJJ", ("청주",), ("Cheongju",)),
+    ("MWX", ("무안",), ("Muan",)),
+    ("RSU", ("여수",), ("Yeosu",)),
+    ("USN", ("울산",), ("Ulsan",)),
+    ("KPO", ("포항경주", "포항"), ("Pohang",)),
+    ("HIN", ("사천", "진주"), ("Sacheon",)),
+    ("WJU", ("원주",), ("Wonju",)),
+    ("YNY", ("양양",), ("Yangyang",)),
+    ("KUV", ("군산",), ("Gunsan",)),
+    # 일본
+    ("TYO", ("도쿄", "동경"), ("Tokyo",)),
+    ("NRT", ("나리타",), ("Narita",)),
+    ("HND", ("하네다",), ("Haneda",)),
+    ("OSA", ("오사카",), ("Osaka",)),
+    ("KIX", ("간사이",), ("Kansai",)),
+    ("FUK", ("후쿠오카",), ("Fukuoka",)),
+    ("CTS", ("삿포로", "신치토세"), ("Sapporo",)),
+    ("OKA", ("오키나와", "나하"), ("Okinawa", "Naha")),
+    ("NGO", ("나고야",), ("Nagoya",)),
+    ("KMJ", ("구마모토",), ("Kumamoto",)),
+    ("KOJ", ("가고시마",), ("Kagoshima",)),
+    ("OIT", ("오이타",), ("Oita",)),
+    ("MYJ", ("마쓰야마", "마츠야마"), ("Matsuyama",)),
+    ("HIJ", ("히로시마",), ("Hiroshima",)),
+    ("TAK", ("다카마쓰", "다카마츠"), ("Takamatsu",)),
+    ("SDJ", ("센다이",), ("Sendai",)),
+    ("KKJ", ("기타큐슈",), ("Kitakyushu",)),
+    ("FSZ", ("시즈오카",), ("Shizuoka",)),
+    ("NGS", ("나가사키",), ("Nagasaki",)),
+    ("OKJ", ("오카야마",), ("Okayama",)),
+    ("KIJ", ("니가타",), ("Niigata",)),
+    ("AOJ", ("아오모리",), ("Aomori",)),
+    ("YGJ", ("요나고",), ("Yonago",)),
+    ("MMY", ("미야코지마",), ("Miyakojima",)),
+    # 중국·홍콩·마카오·대만·몽골
+    ("BJS", ("베이징", "북경"), ("Beijing",)),
+    ("PEK", ("서우두",), ()),
+    ("PKX", ("다싱",), ("Daxing",)),
+    ("SHA", ("상하이", "상해"), ("Shanghai",)),
+    ("PVG", ("푸동",), ("Pudong",)),
+    ("CAN", ("광저우",), ("Guangzhou",)),
+    ("SZX", ("선전", "심천"), ("Shenzhen",)),
+    ("TAO", ("칭다오", "청도"), ("Qingdao",)),
+    ("YNT", ("옌타이", "연태"), ("Yantai",)),
+    ("WEH", ("웨이하이", "위해"), ("Weihai",)),
+    ("DLC", ("다롄", "대련"), ("Dalian",)),
+    ("SHE", ("선양", "심양"), ("Shenyang",)),
+    ("YNJ", ("옌지", "연길"), ("Yanji",)),
+    ("HGH", ("항저우",), ("Hangzhou",)),
+    ("NKG", ("난징",), ("Nanjing",)),
+    ("CGQ", ("창춘",), ("Changchun",)),
+    ("HRB", ("하얼빈",), ("Harbin",)),
+    ("SYX", ("싼야", "산야"), ("Sanya",)),
+    ("ZJJ", ("장자제", "장가계"), ("Zhangjiajie",)),
+    ("HKG", ("홍콩",), ("Hong Kong",)),
+    ("MFM", ("마카오",), ("Macau", "Macao")),
+    ("TPE", ("타이베이", "타이페이"), ("Taipei",)),
+    ("TSA", ("쑹산", "송산"), ("Songshan",)),
+    ("KHH", ("가오슝",), ("Kaohsiung",)),
+    ("RMQ", ("타이중",), ("Taichung",)),
+    ("ULN", ("울란바토르", "울란바타르"), ("Ulaanbaatar", "Ulan Bator")),
+    # 동남아
+    ("BKK", ("방콕",), ("Bangkok",)),
+    ("DMK", ("돈므앙",), ("Don Mueang",)),
+    ("HKT", ("푸껫", "푸켓"), ("Phuket",)),
+    ("CNX", ("치앙마이",), ("Chiang Mai",)),
+    ("DAD", ("다낭",), ("Da Nang", "Danang")),
+    ("SGN", ("호찌민", "호치민"), ("Ho Chi Minh",)),
+    ("HAN", ("하노이",), ("Hanoi",)),
+    ("CXR", ("나트랑", "냐짱"), ("Nha Trang",)),
+    ("PQC", ("푸꾸옥", "푸쿠옥"), ("Phu Quoc",)),
+    ("DLI", ("달랏",), ("Dalat", "Da Lat")),
+    ("HPH", ("하이퐁",), ("Haiphong",)),
+    ("MNL", ("마닐라",), ("Manila",)),
+    ("CEB", ("세부",), ("Cebu",)),
+    ("CRK", ("클락", "클라크"), ("Clark",)),
+    ("KLO", ("보라카이", "칼리보"), ("Boracay", "Kalibo")),
+    ("TAG", ("보홀",), ("Bohol",)),
+    ("SIN", ("싱가포르", "싱가폴"), ("Singapore",)),
+    ("KUL", ("쿠알라룸푸르",), ("Kuala Lumpur",)),
+    ("BKI", ("코타키나발루",), ("Kota Kinabalu",)),
+    ("DPS", ("발리", "덴파사르"), ("Bali", "Denpasar")),
+    ("CGK", ("자카르타",), ("Jakarta",)),
+    ("VTE", ("비엔티안",), ("Vientiane",)),
+    ("PNH", ("프놈펜",), ("Phnom Penh",)),
+    ("REP", ("씨엠립", "시엠립"), ("Siem Reap",)),
+    ("RGN", ("양곤",), ("Yangon",)),
+    # 대양주·미주·유럽·기타
+    ("GUM", ("괌",), ("Guam",)),
+    ("SPN", ("사이판",), ("Saipan",)),
+    ("HNL", ("호놀룰루", "하와이"), ("Honolulu", "Hawaii")),
+    ("LAX", ("로스앤젤레스", "로스엔젤레스"), ("Los Angeles",)),
+    ("SFO", ("샌프란시스코",), ("San Francisco",)),
+    ("NYC", ("뉴욕",), ("New York",)),
+    ("SEA", ("시애틀",), ("Seattle",)),
+    ("LAS", ("라스베이거스", "라스베가스"), ("Las Vegas",)),
+    ("YVR", ("밴쿠버",), ("Vancouver",)),
+    ("SYD", ("시드니",), ("Sydney",)),
+    ("BNE", ("브리즈번",), ("Brisbane",)),
+    ("LON", ("런던",), ("London",)),
+    ("PAR", ("파리",), ("Paris",)),
+    ("FRA", ("프랑크푸르트",), ("Frankfurt",)),
+    ("ROM", ("로마",), ("Rome",)),
+    ("BCN", ("바르셀로나",), ("Barcelona",)),
+    ("BUD", ("부다페스트",), ("Budapest",)),
+    ("ZAG", ("자그레브",), ("Zagreb",)),
+    ("PRG", ("프라하",), ("Prague",)),
+    ("IST", ("이스탄불",), ("Istanbul",)),
+    ("DXB", ("두바이",), ("Dubai",)),
+    ("ALA", ("알마티",), ("Almaty",)),
+    ("TAS", ("타슈켄트",), ("Tashkent",)),
+    ("VVO", ("블라디보스토크", "블라디보스톡"), ("Vladivostok",)),
+    ("DEL", ("델리",), ("Delhi",)),
+    ("KTM", ("카트만두",), ("Kathmandu",)),
+)
+
+# 일상어와 같은 한국어 이름 ("세부 내용", "위해", "선전", "청도"). 노선 연결 기호(-, →, ~) 바로 옆일 때만 지명으로 봄
+AMBIGUOUS_KO_NAMES: frozenset[str] = frozenset({"세부", "위해", "선전", "청도"})
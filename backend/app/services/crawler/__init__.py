@@ -1,21 +1,32 @@
 """
 크롤러 패키지: 항공사/도메인별 전략 패턴.
-- run_notice_detection(session) → 새 공지 목록
-- fetch_html, compute_hash, get_notice_content_from_html (공통 유틸)
+- run_notice_detection(session, queue) → 새 공지 목록 (MonitorUrl 동시 크롤링, 커밋되는 대로 queue 로 공지 id 전달)
+- fetch_html, fetch_page(조건부 GET), compute_hash, get_notice_content_from_html (공통 유틸)
 """
+import asyncio
 import logging
+from datetime import datetime
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.db import AsyncSessionLocal
 from app.models.db_models import Airline, MonitorUrl
 
 from app.services.crawler.base import CrawlResult, CrawlerStrategy
 from app.services.crawler.common import (
+    FetchResult,
     compute_hash,
     fetch_html,
+    fetch_page,
     get_notice_content_from_html,
 )
+from app.services import response_cache
+from app.services.crawler import politeness, seen_index
+from app.services.crawler.fetch_tiers import host_of
 from app.services.crawler.registry import get_strategy, get_strategy_for_url, register
+from app.services.crawler.universal import selectors_for
 
 logger = logging.getLogger(__name__)
 
@@ -24,41 +35,98 @@ from app.services.crawler.registry import _register_builtin_strategies
 _register_builtin_strategies()
 
 
-async def run_notice_detection(session: AsyncSession) -> list[CrawlResult]:
+async def _crawl_monitor_url(monitor_url_id: str, airline_name: str) -> list[CrawlResult]:
+    """MonitorUrl 하나를 자체 세션으로 수집·크롤링 후 커밋. 실패해도 다른 URL에 영향 없음."""
+    async with AsyncSessionLocal() as session:
+        try:
+            row = await session.get(MonitorUrl, monitor_url_id)
+            if row is None:
+                return []
+            url = row.url
+            airline_id = row.airline_id
+            fetched = await fetch_page(
+                url,
+                etag=row.http_etag,
+                last_modified=row.http_last_modified,
+                wait_selector=selectors_for(row).link_css or None,
+            )
+            if fetched.not_modified:
+                # 304: 본문/파싱 생략
+                row.last_checked_at = datetime.utcnow()
+                await session.commit()
+                logger.info("변경 없음(304), 스킵: %s", url)
+                return []
+            html = fetched.html
+            if not html:
+                logger.warning("크롤링 스킵(HTML 수집 실패): %s", url)
+                return []
+
+            # 검증자는 전략보다 먼저 기록: 처리하지 못한 항목이 남으면 전략이 비워서 다음 크롤링이 304 로 건너뛰지 않게 함
+            row.http_etag = fetched.etag
+            row.http_last_modified = fetched.last_modified
+            strategy = get_strategy(url=url)
+            logger.info("크롤링 %s: %s", airline_name or airline_id, type(strategy).__name__)
+            part = await strategy.crawl(session, row, html, airline_id, airline_name)
+            if part:
+                logger.info("  → 새 공지 %d건: %s", len(part), [p[3][:60] + "..." if len(p[3]) > 60 else p[3] for p in part])
+            await session.commit()
+            seen_index.remember(monitor_url_id, airline_id, [p[3] for p in part])
+            if part:
+                response_cache.bump_generation()
+            return part
+        except Exception as e:
+            await session.rollback()
+            logger.exception("크롤링 실패 %s: %s", monitor_url_id, e)
+            return []
+
+
+async def run_notice_detection(
+    session: AsyncSession,
+    queue: "asyncio.Queue[str] | None" = None,
+) -> list[CrawlResult]:
     """
-    모든 MonitorUrl에 대해: URL 도메인별 전략으로 크롤링.
-    반환: 새 공지 목록 [(airline_id, airline_name, source_url, content_type, raw_content), ...]
+    모든 MonitorUrl을 동시에 크롤링 (전체 crawl_concurrency, 호스트별 crawl_per_host_concurrency 제한).
+    URL마다 별도 세션에서 저장·커밋하므로 느린 사이트가 다른 항공사를 막지 않음. session 은 목록 조회용.
+    queue 가 있으면 URL 하나가 커밋될 때마다 새 공지 id 를 넣음 (가득 차면 분석이 따라올 때까지 대기).
+    반환: 새 공지 목록 [(notice_id, airline_id, airline_name, source_url), ...]
     """
-    result: list[CrawlResult] = []
-    q = select(MonitorUrl).join(Airline)
+    q = select(
+        MonitorUrl.id, MonitorUrl.url, Airline.name, Airline.crawl_rate_per_second, Airline.crawl_burst
+    ).join(Airline)
     res = await session.execute(q)
-    rows = res.scalars().all()
+    targets = res.all()
+    # 목록만 읽었으므로 트랜잭션을 바로 끝냄 (사이클 내내 열려 있으면 /changes 의 상한 시각을 붙잡음)
+    await session.commit()
+    # 항공사별 속도 제한을 해당 호스트 버킷에 반영 (상세/다음 페이지 요청도 같은 호스트면 공유)
+    for _, url, _, rate, burst in targets:
+        politeness.configure_host(host_of(url), rate, burst)
 
-    for row in rows:
-        url = row.url
-        airline_id = row.airline_id
-        html = await fetch_html(url)
-        if not html:
-            logger.warning("크롤링 스킵(HTML 수집 실패): %s", url)
-            continue
-        airline_q = select(Airline).where(Airline.id == airline_id)
-        ar = await session.execute(airline_q)
-        airline = ar.scalar_one_or_none()
-        airline_name = airline.name if airline else ""
+    global_sem = asyncio.Semaphore(max(1, settings.crawl_concurrency))
+    host_sems: dict[str, asyncio.Semaphore] = {}
 
-        strategy = get_strategy(url=url)
-        logger.info("크롤링 %s: %s", airline_name or airline_id, type(strategy).__name__)
-        part = await strategy.crawl(session, row, html, airline_id, airline_name)
-        if part:
-            logger.info("  → 새 공지 %d건: %s", len(part), [p[2][:60] + "..." if len(p[2]) > 60 else p[2] for p in part])
-        result.extend(part)
+    async def worker(monitor_url_id: str, url: str, airline_name: str) -> list[CrawlResult]:
+        host = host_of(url)
+        host_sem = host_sems.get(host)
+        if host_sem is None:
+            host_sem = host_sems[host] = asyncio.Semaphore(max(1, settings.crawl_per_host_concurrency))
+        # 호스트 슬롯을 먼저 잡아야 같은 호스트 대기 중에 전체 슬롯을 점유하지 않음
+        async with host_sem, global_sem:
+            part = await _crawl_monitor_url(monitor_url_id, airline_name or "")
+        # 슬롯을 반납한 뒤 전달: 분석이 밀려 queue 가 차도 다른 URL 크롤링은 계속됨
+        if queue is not None:
+            for notice_id, *_ in part:
+                await queue.put(notice_id)
+        return part
 
-    return result
+    parts = await asyncio.gather(*(worker(mid, url, name) for mid, url, name, _, _ in targets))
+    return [item for part in parts for item in part]
 
 
 __all__ = [
     "run_notice_detection",
     "fetch_html",
+    "fetch_page",
+    "FetchResult",
     "compute_hash",
     "get_notice_content_from_html",
     "register",
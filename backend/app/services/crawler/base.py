@@ -7,8 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db_models import MonitorUrl
 
-# (airline_id, airline_name, source_url, content_type, raw_content)
-CrawlResult = tuple[str, str, str, str, str]
+# (notice_id, airline_id, airline_name, source_url). 본문은 담지 않음 (분석 단계에서 id 로 조회)
+CrawlResult = tuple[str, str, str, str]
 
 
 class CrawlerStrategy(Protocol):
@@ -24,7 +24,8 @@ class CrawlerStrategy(Protocol):
     ) -> list[CrawlResult]:
         """
         목록 페이지 HTML(이미 fetch됨)과 row 정보로 크롤링 후 새 공지만 DB에 저장.
-        row.last_html_hash, last_checked_at 은 호출자가 갱신.
-        반환: 새로 생성된 공지 목록 [(airline_id, airline_name, source_url, content_type, raw_content), ...]
+        row.http_etag, http_last_modified 는 호출자가 먼저 기록. 처리하지 못한 항목(상세 수집 실패 등)이 남으면
+        전략이 둘 다 None 으로 비워 다음 크롤링에서 304 로 건너뛰지 않게 함.
+        반환: 새로 생성된 공지 목록 [(notice_id, airline_id, airline_name, source_url), ...]
         """
         ...
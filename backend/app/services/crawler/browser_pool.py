@@ -0,0 +1,224 @@
+"""
+DrissionPage 헤드리스 브라우저 풀: Chromium 프로세스를 계속 띄워 두고 요청마다 탭만 열고 닫음.
+- 최대 browser_pool_size 개 브라우저를 필요할 때 실행
+- browser_max_navigations 회 탐색 후 브라우저 재시작(메모리 누수 방지)
+- 대여 전 헬스 체크, 응답 없는 브라우저는 재시작
+- wait_until_ready(): 고정 sleep 대신 조건(선택자 매칭/챌린지 해제/네트워크 유휴)이 만족되면 즉시 반환
+동기 API이므로 asyncio.to_thread 안에서 사용. 스레드를 잡기 전에 browser_slot() 으로 빈 브라우저를 기다림
+(기본 실행기는 파싱·DNS 조회와 공유하므로 브라우저 대기로 스레드를 점유하지 않도록).
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _launch_browser() -> Any:
+    from DrissionPage import ChromiumOptions, ChromiumPage
+
+    co = ChromiumOptions()
+    co.auto_port()
+    co.set_browser_path(settings.browser_path)
+    co.headless()
+    co.set_argument('--window-size=1920,1080')
+    co.set_argument('--disable-blink-features=AutomationControlled')
+    co.set_argument('--no-sandbox')
+    co.set_argument('--disable-gpu')
+    co.set_argument('--disable-dev-shm-usage')
+
+    page = ChromiumPage(addr_or_opts=co)
+    page.set.window.mini()  # 화면 최소화
+    return page
+
+
+# Cloudflare 등 봇 챌린지 페이지 제목
+CHALLENGE_TITLES = ("just a moment", "잠시만 기다리십시오", "attention required")
+
+# [readyState, title, 선택자 매칭 여부(선택자 없거나 잘못되면 null), 리소스 요청 수, 챌린지 요소 존재]
+_READY_PROBE_JS = """
+const sel = arguments[0];
+let matched = null;
+if (sel) {
+    try { matched = document.querySelector(sel) !== null; } catch (e) { matched = null; }
+}
+const challenge = document.querySelector(
+    '#challenge-form, #challenge-running, #cf-challenge-running, script[src*="challenge-platform"]'
+) !== null;
+return [document.readyState, document.title, matched, performance.getEntriesByType('resource').length, challenge];
+"""
+
+
+def wait_until_ready(
+    tab: Any,
+    ready_selector: str | None = None,
+    timeout: float | None = None,
+    poll_interval: float = 0.25,
+    idle_seconds: float = 0.75,
+) -> bool:
+    """
+    페이지가 준비되면 바로 반환 (최대 timeout 초). 준비 조건:
+    - 챌린지 페이지가 아니고 document.readyState == 'complete'
+    - ready_selector 가 있으면 매칭될 때, 없으면(또는 브라우저가 해석 못 하면) 리소스 요청이 idle_seconds 동안 멈췄을 때
+    - 선택자가 끝내 매칭되지 않아도 네트워크가 충분히(4×idle_seconds) 조용하면 반환
+    반환: 조건 만족 여부 (타임아웃이면 False)
+    """
+    deadline = time.monotonic() + (settings.browser_wait_timeout_seconds if timeout is None else timeout)
+    last_count = -1
+    idle_since = time.monotonic()
+    while True:
+        now = time.monotonic()
+        try:
+            state, title, matched, resource_count, challenge = tab.run_js(_READY_PROBE_JS, ready_selector or "")
+        except Exception:
+            state, title, matched, resource_count, challenge = "loading", "", None, -1, False
+        if resource_count != last_count:
+            last_count = resource_count
+            idle_since = now
+        is_challenge = challenge or any(t in str(title or "").lower() for t in CHALLENGE_TITLES)
+        if not is_challenge and state == "complete":
+            idle = now - idle_since
+            if matched is True:
+                return True
+            if matched is None and idle >= idle_seconds:
+                return True
+            if matched is False and idle >= idle_seconds * 4:
+                return True
+        if now >= deadline:
+            return False
+        time.sleep(poll_interval)
+
+
+class _PooledBrowser:
+    """풀 안의 브라우저 프로세스 하나."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.page: Any = None
+        self.navigations = 0
+
+    def is_healthy(self) -> bool:
+        if self.page is None:
+            return False
+        try:
+            return self.page.run_js("return 1;") == 1
+        except Exception:
+            return False
+
+    def prepare(self, max_navigations: int) -> None:
+        """재활용 한도 초과 또는 응답 없음이면 재시작, 아직 없으면 실행."""
+        if self.page is not None and self.navigations >= max_navigations:
+            logger.info("브라우저 #%d 재활용 (%d회 탐색)", self.index, self.navigations)
+            self.quit()
+        elif self.page is not None and not self.is_healthy():
+            logger.warning("브라우저 #%d 헬스 체크 실패, 재시작", self.index)
+            self.quit()
+        if self.page is None:
+            self.page = _launch_browser()
+            self.navigations = 0
+
+    def quit(self) -> None:
+        if self.page is not None:
+            try:
+                self.page.quit()
+            except Exception as e:
+                logger.warning("브라우저 #%d 종료 실패: %s", self.index, e)
+        self.page = None
+        self.navigations = 0
+
+
+class BrowserPool:
+    """브라우저를 빌려 새 탭을 열어 주는 풀. tab() 컨텍스트가 끝나면 탭을 닫고 브라우저 반납."""
+
+    def __init__(self, size: int, max_navigations: int, acquire_timeout: float) -> None:
+        self._max_navigations = max(1, max_navigations)
+        self._acquire_timeout = acquire_timeout
+        self._browsers = [_PooledBrowser(i) for i in range(max(1, size))]
+        self._idle: queue.Queue[_PooledBrowser] = queue.Queue()
+        for b in self._browsers:
+            self._idle.put(b)
+        self._closed = False
+
+    @contextmanager
+    def tab(self) -> Iterator[Any]:
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        try:
+            browser = self._idle.get(timeout=self._acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no idle browser within {self._acquire_timeout}s")
+        try:
+            browser.prepare(self._max_navigations)
+            tab = browser.page.new_tab()
+            browser.navigations += 1
+            try:
+                yield tab
+            finally:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+        except Exception:
+            # 탭 단계에서 실패한 브라우저는 상태를 믿을 수 없으므로 다음 대여 때 새로 실행
+            browser.quit()
+            raise
+        finally:
+            if self._closed:
+                browser.quit()
+            self._idle.put(browser)
+
+    def close(self) -> None:
+        self._closed = True
+        for b in self._browsers:
+            b.quit()
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+_slots: asyncio.Semaphore | None = None
+
+
+@asynccontextmanager
+async def browser_slot() -> AsyncIterator[None]:
+    """브라우저 하나가 빌 때까지 이벤트 루프에서 대기 (최대 browser_acquire_timeout_seconds).
+    이 안에서 asyncio.to_thread 로 tab() 을 쓰면 스레드는 브라우저가 있을 때만 점유됨."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, settings.browser_pool_size))
+    timeout = settings.browser_acquire_timeout_seconds
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"no idle browser within {timeout}s") from None
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+def get_browser_pool() -> BrowserPool:
+    """설정값으로 만든 전역 브라우저 풀 (최초 호출 시 생성)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=settings.browser_pool_size,
+                max_navigations=settings.browser_max_navigations,
+                acquire_timeout=settings.browser_acquire_timeout_seconds,
+            )
+        return _pool
+
+
+async def close_browser_pool() -> None:
+    """앱 종료 시 모든 브라우저 프로세스 종료."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await asyncio.to_thread(pool.close)
@@ -1,14 +1,19 @@
 """
-크롤러 공통: HTTP 요청, hash, HTML에서 텍스트/이미지 추출.
+크롤러 공통: HTTP 요청(호스트별 단계 학습), hash, HTML에서 텍스트/이미지 추출.
 """
 import hashlib
 import logging
-from urllib.parse import urljoin, urlparse
+import re
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
 
-import httpx
-from bs4 import BeautifulSoup
 
 from app.config import settings
+from app.services.crawler import fetch_tiers, politeness
+from app.services.crawler.browser_pool import browser_slot, get_browser_pool, wait_until_ready
+from app.services.crawler.document import HtmlDocument, as_document
+from app.services.http_client import get_curl_session, get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,44 +39,28 @@ def browser_headers(url: str) -> dict[str, str]:
     }
 
 
-def _sync_fetch_html_drission(url: str) -> str:
+def _sync_fetch_html_drission(url: str, wait_selector: str | None = None) -> str:
+    """풀에서 브라우저 탭을 빌려 HTML 수집. 고정 대기 대신 wait_until_ready로 준비되는 즉시 반환."""
     try:
-        from DrissionPage import ChromiumPage, ChromiumOptions
-        import time
-        
-        co = ChromiumOptions()
-        co.auto_port()
-        co.set_browser_path('/usr/bin/google-chrome')
-        co.headless()
-        co.set_argument('--window-size=1920,1080')
-        co.set_argument('--disable-blink-features=AutomationControlled')
-        co.set_argument('--no-sandbox')
-        co.set_argument('--disable-gpu')
-        co.set_argument('--disable-dev-shm-usage')
-        
-        page = ChromiumPage(addr_or_opts=co)
-        page.set.window.mini() # 화면 최소화
-        page.get(url)
-        time.sleep(5)
-        
-        # Cloudflare 대기
-        title = str(page.title) if page.title else ""
-        html_str = str(page.html) if page.html else ""
-        if "challenge" in html_str.lower() or "just a moment" in title.lower() or "잠시만 기다리십시오" in title:
-            time.sleep(10)
-            
-        html = page.html
-        page.quit()
-        return html
+        with get_browser_pool().tab() as tab:
+            tab.get(url)
+            if not wait_until_ready(tab, wait_selector):
+                logger.info("fetch_html_drission: 준비 조건 타임아웃, 현재 HTML 사용 %s", url)
+            return str(tab.html or "")
     except Exception as e:
-        import logging
-        logging.warning(f"fetch_html_drission failed {url}: {e}")
+        logger.warning("fetch_html_drission failed %s: %s", url, e)
         return ""
 
-async def fetch_html_drission(url: str) -> str:
-    """SPA/Bot 차단 사이트를 위해 DrissionPage(강력 우회)로 HTML 반환 (비동기 래핑)."""
+async def fetch_html_drission(url: str, wait_selector: str | None = None) -> str:
+    """SPA/Bot 차단 사이트를 위해 DrissionPage(강력 우회)로 HTML 반환 (비동기 래핑).
+    wait_selector(CSS)가 있으면 그 요소가 나타날 때까지만 대기."""
     import asyncio
-    return await asyncio.to_thread(_sync_fetch_html_drission, url)
+    try:
+        async with browser_slot():
+            return await asyncio.to_thread(_sync_fetch_html_drission, url, wait_selector)
+    except TimeoutError as e:
+        logger.warning("fetch_html_drission failed %s: %s", url, e)
+        return ""
 
 
 async def fetch_html_playwright(url: str) -> str:
@@ -80,83 +69,307 @@ async def fetch_html_playwright(url: str) -> str:
     return await asyncio.to_thread(_sync_fetch_html_playwright, url)
 
 
-async def fetch_html(url: str) -> str:
-    """URL의 HTML 본문 반환 (에러 시 빈 문자열). 먼저 httpx, 403이면 Chrome 위장 curl_cffi 재시도."""
-    if "jinair.com" in url or "parataair.com" in url or "flyairseoul.com" in url:
-        scraper_api_key = getattr(settings, "scraper_api_key", None)
-        if scraper_api_key:
-            # Route through ScraperAPI to bypass Cloudflare
-            import urllib.parse
-            target_url = urllib.parse.quote(url)
-            # ParataAir fails inside ScraperAPI when render=true, but works perfectly when render=false
-            render_param = "false" if "parataair.com" in url else "true"
-            scraper_url = f"http://api.scraperapi.com?api_key={scraper_api_key}&url={target_url}&render={render_param}&country_code=kr"
-            logger.info("Routing blocked URL through ScraperAPI: %s", url)
-            try:
-                # Need a longer timeout since render=true waits for JS
-                async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-                    r = await client.get(scraper_url)
-                    r.raise_for_status()
-                    return r.text
-            except Exception as e:
-                logger.warning("ScraperAPI failed for %s: %s", url, e)
-                return ""
-        else:
-            return await fetch_html_drission(url)
-        
-    headers = browser_headers(url)
+@dataclass
+class FetchResult:
+    """fetch_page 결과. not_modified=True(304)면 html은 비어 있고 검증자(etag/last_modified)만 유지."""
+    html: str = ""
+    not_modified: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _result_from_response(r, etag: str | None, last_modified: str | None) -> FetchResult:
+    """304면 이전 검증자 유지, 200이면 응답 헤더의 검증자 저장."""
+    if r.status_code == 304:
+        return FetchResult(
+            not_modified=True,
+            etag=r.headers.get("etag") or etag,
+            last_modified=r.headers.get("last-modified") or last_modified,
+        )
+    return FetchResult(
+        html=r.text,
+        etag=r.headers.get("etag"),
+        last_modified=r.headers.get("last-modified"),
+    )
+
+
+class TierBlocked(Exception):
+    """수집 단계가 차단됨(403/봇 챌린지 등) → 다음 단계로 올라가서 재시도."""
+
+
+# 200 응답이어도 본문이 봇 챌린지 페이지면 차단으로 간주
+_CHALLENGE_MARKERS = ("challenge-platform", "cf-chl-", "<title>just a moment")
+
+
+def _looks_like_challenge(html: str) -> bool:
+    head = html[:20000].lower()
+    return any(m in head for m in _CHALLENGE_MARKERS)
+
+
+def _raise_if_rate_limited(r) -> None:
+    """429, 또는 Retry-After 가 붙은 503 이면 RateLimited."""
+    retry_after = r.headers.get("retry-after")
+    if r.status_code == 429 or (r.status_code == 503 and retry_after):
+        raise politeness.RateLimited(politeness.parse_retry_after(retry_after))
+
+
+async def _fetch_httpx(url: str, etag: str | None, last_modified: str | None) -> FetchResult:
+    headers = {**browser_headers(url), **_conditional_headers(etag, last_modified)}
+    r = await get_http_client().get(url, headers=headers)
+    _raise_if_rate_limited(r)
+    if r.status_code == 403:
+        raise TierBlocked("HTTP 403")
+    if r.status_code != 304:
+        r.raise_for_status()
+    result = _result_from_response(r, etag, last_modified)
+    if result.html and _looks_like_challenge(result.html):
+        raise TierBlocked("challenge page")
+    return result
+
+
+async def _fetch_curl(url: str, impersonate: str, etag: str | None, last_modified: str | None) -> FetchResult:
+    parsed = urlparse(url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    # curl_cffi로 TLS/헤더 위장. 헤더는 최소로 넘겨서 impersonate가 맞게 채우게 함.
+    minimal_headers = {
+        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+        "Referer": origin + "/",
+        **_conditional_headers(etag, last_modified),
+    }
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=settings.http_timeout_seconds,
-            headers=headers,
-        ) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            return r.text
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code != 403:
-            logger.warning("fetch_html failed %s: %s", url, e)
-            return ""
-        parsed = urlparse(url)
-        origin = f"{parsed.scheme}://{parsed.netloc}"
-        # 403 시 curl_cffi로 TLS/헤더 위장. 헤더는 최소로 넘겨서 impersonate가 맞게 채우게 함.
-        minimal_headers = {
-            "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-            "Referer": origin + "/",
-        }
-        for impersonate in ("chrome", "safari15_5"):
-            try:
-                from curl_cffi.requests import AsyncSession as CurlAsyncSession
-                async with CurlAsyncSession(impersonate=impersonate) as client:
-                    r = await client.get(url, timeout=settings.http_timeout_seconds, headers=minimal_headers)
-                    r.raise_for_status()
-                    return r.text
-            except Exception as e2:
-                logger.warning("fetch_html (curl_cffi %s) failed %s: %s", impersonate, url, e2)
-        return ""
+        r = await get_curl_session(impersonate).get(url, timeout=settings.http_timeout_seconds, headers=minimal_headers)
     except Exception as e:
-        logger.warning("fetch_html failed %s: %s", url, e)
-        return ""
+        # TLS 지문 차단은 연결 실패로 나타나는 경우가 많아 다음 위장 단계로
+        raise TierBlocked(str(e)) from e
+    _raise_if_rate_limited(r)
+    if r.status_code == 403:
+        raise TierBlocked("HTTP 403")
+    if r.status_code != 304:
+        r.raise_for_status()
+    result = _result_from_response(r, etag, last_modified)
+    if result.html and _looks_like_challenge(result.html):
+        raise TierBlocked("challenge page")
+    return result
+
+
+async def _fetch_scraperapi(url: str) -> FetchResult:
+    import urllib.parse
+    target_url = urllib.parse.quote(url)
+    # ParataAir fails inside ScraperAPI when render=true, but works perfectly when render=false
+    render_param = "false" if "parataair.com" in url else "true"
+    scraper_url = f"http://api.scraperapi.com?api_key={settings.scraper_api_key}&url={target_url}&render={render_param}&country_code=kr"
+    logger.info("Routing blocked URL through ScraperAPI: %s", url)
+    try:
+        # render=true 는 JS 대기 때문에 타임아웃이 긴 scraper 클라이언트 사용
+        r = await get_http_client("scraper").get(scraper_url)
+    except Exception as e:
+        raise TierBlocked(f"ScraperAPI: {e}") from e
+    # 429 = 게이트웨이 동시 요청 한도 초과 (대상 사이트와 별개로 SCRAPERAPI_HOST 버킷에서 대기)
+    _raise_if_rate_limited(r)
+    if r.status_code >= 400:
+        raise TierBlocked(f"ScraperAPI: HTTP {r.status_code}")
+    return FetchResult(html=r.text)
+
+
+async def _fetch_browser(url: str, wait_selector: str | None) -> FetchResult:
+    html = await fetch_html_drission(url, wait_selector)
+    if not html:
+        raise TierBlocked("browser returned empty html")
+    return FetchResult(html=html)
+
+
+async def _fetch_tier(
+    tier: str, url: str, etag: str | None, last_modified: str | None, wait_selector: str | None
+) -> FetchResult:
+    if tier == fetch_tiers.TIER_HTTPX:
+        return await _fetch_httpx(url, etag, last_modified)
+    if tier == fetch_tiers.TIER_CURL_CHROME:
+        return await _fetch_curl(url, "chrome", etag, last_modified)
+    if tier == fetch_tiers.TIER_CURL_SAFARI:
+        return await _fetch_curl(url, "safari15_5", etag, last_modified)
+    if tier == fetch_tiers.TIER_SCRAPERAPI:
+        return await _fetch_scraperapi(url)
+    if tier == fetch_tiers.TIER_BROWSER:
+        return await _fetch_browser(url, wait_selector)
+    raise ValueError(f"unknown fetch tier: {tier}")
+
+
+async def _fetch_tier_politely(
+    tier: str,
+    limit_host: str,
+    url: str,
+    etag: str | None,
+    last_modified: str | None,
+    wait_selector: str | None,
+) -> tuple[FetchResult, float]:
+    """
+    limit_host 의 토큰을 받은 뒤 요청. 429 면 Retry-After(없으면 지수 백오프)만큼 호스트를 멈추고
+    crawl_rate_limit_retries 회까지 재시도. 반환: (결과, 요청 소요 초)
+    """
+    retries = 0
+    while True:
+        await politeness.acquire(limit_host)
+        started = time.monotonic()
+        try:
+            result = await _fetch_tier(tier, url, etag, last_modified, wait_selector)
+        except politeness.RateLimited as e:
+            delay = politeness.penalize(limit_host, e.retry_after)
+            if retries >= settings.crawl_rate_limit_retries or delay > settings.crawl_max_retry_after_seconds:
+                raise
+            retries += 1
+            logger.info("fetch_html (%s) 429 %s: %.1f초 후 재시도 (%d회)", tier, url, delay, retries)
+            continue
+        politeness.record_ok(limit_host)
+        return result, time.monotonic() - started
+
+
+async def fetch_html(url: str, wait_selector: str | None = None) -> str:
+    """URL의 HTML 본문 반환 (에러 시 빈 문자열). 조건부 요청 없이 fetch_page 사용."""
+    return (await fetch_page(url, wait_selector=wait_selector)).html
+
+
+async def fetch_page(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    wait_selector: str | None = None,
+) -> FetchResult:
+    """
+    URL의 HTML 본문 반환 (에러 시 빈 html).
+    호스트별로 학습된 단계(fetch_tiers)부터 시도: httpx → curl_cffi(chrome/safari) → ScraperAPI → 브라우저
+    (ScraperAPI·브라우저는 반복 차단된 호스트만).
+    차단(403/챌린지)이면 다음 단계로, 그 외 오류(404, 타임아웃 등)면 중단.
+    모든 요청은 호스트별 속도 제한(politeness)을 거치며 429 는 Retry-After 를 지켜 재시도.
+    etag / last_modified 가 있으면 If-None-Match / If-Modified-Since 로 조건부 요청 (304면 not_modified).
+    ScraperAPI / 브라우저 단계는 조건부 요청을 지원하지 않아 항상 전체 본문.
+    wait_selector: 브라우저 렌더링 시 이 CSS 선택자가 매칭되면 바로 HTML 수집.
+    """
+    host = fetch_tiers.host_of(url)
+    for tier in fetch_tiers.tier_plan(url):
+        limit_host = politeness.SCRAPERAPI_HOST if tier == fetch_tiers.TIER_SCRAPERAPI else host
+        try:
+            result, elapsed = await _fetch_tier_politely(tier, limit_host, url, etag, last_modified, wait_selector)
+        except TierBlocked as e:
+            fetch_tiers.record_failure(url, tier)
+            logger.info("fetch_html (%s) blocked %s: %s", tier, url, e)
+            continue
+        except Exception as e:
+            fetch_tiers.record_failure(url, tier)
+            logger.warning("fetch_html (%s) failed %s: %s", tier, url, e)
+            return FetchResult()
+        fetch_tiers.record_success(url, tier, elapsed)
+        return result
+    fetch_tiers.record_blocked(url)
+    logger.warning("fetch_html: 모든 수집 단계 실패 %s", url)
+    return FetchResult()
 
 
 def compute_hash(html: str) -> str:
     return hashlib.sha256(html.encode("utf-8", errors="replace")).hexdigest()
 
 
-async def get_notice_content_from_html(html: str, url: str) -> tuple[str, str]:
+# 공지 본문 영역 후보 (extract_notice_content / compute_content_fingerprint 공용)
+_NOTICE_REGION_SELECTORS = (
+    "article", ".notice", ".board", ".content", "[class*='notice']",
+    "[class*='event']", "main", ".detail",
+)
+
+# 지문 계산 시 제거하는 요소 (스크립트·CSRF 토큰·메타 등 매 요청마다 바뀌는 부분)
+_FINGERPRINT_DROP_SELECTOR = "script, style, noscript, template, meta, link, input[type=hidden], svg"
+
+# 캐시 무효화·세션·추적용 쿼리 파라미터 (링크 비교 시 제거)
+_VOLATILE_QUERY_PARAMS = frozenset({
+    "v", "ver", "version", "t", "ts", "_", "timestamp", "time", "cb", "cache", "nocache",
+    "rnd", "rand", "random", "token", "csrf", "_csrf", "csrf_token", "sid", "sessionid",
+    "jsessionid", "phpsessid", "fbclid", "gclid",
+})
+
+# 본문 텍스트에서 가리는 값: 시각(12:34, 12:34:56), 긴 숫자(유닉스 타임스탬프 등), 긴 16진수(토큰·해시)
+_VOLATILE_TEXT = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\b|\b\d{10,}\b|\b[0-9a-fA-F]{16,}\b")
+
+FINGERPRINT_VERSION = "v2"
+
+
+def _stable_link(base_url: str, href: str) -> str | None:
+    """절대 URL로 바꾸고 fragment·변동 쿼리 파라미터를 뺀 뒤 나머지 파라미터를 정렬."""
+    href = (href or "").strip()
+    if not href or href.startswith(("javascript:", "data:", "#", "mailto:", "tel:")):
+        return None
+    parsed = urlparse(urljoin(base_url, href))
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in _VOLATILE_QUERY_PARAMS and not k.lower().startswith("utm_")
+    )
+    return parsed._replace(query=urlencode(query), fragment="").geturl()
+
+
+def fingerprint_scheme(value: str | None) -> str | None:
+    """저장된 hash 의 방식: 'raw'(compute_hash) 또는 'v2:<무시 선택자>' (compute_content_fingerprint)."""
+    if not value:
+        return None
+    return value.rsplit(":", 1)[0] if ":" in value else "raw"
+
+
+def compute_content_fingerprint(html: str | HtmlDocument, url: str, ignore_selector: str | None = None) -> str:
+    """
+    단일 페이지 변경 감지용 지문: 공지 영역의 텍스트 + 안정적인 링크/이미지 주소만 hash.
+    스크립트·숨은 입력(CSRF)·시각·캐시 무효화 쿼리는 제외, ignore_selector(예: 롤링 배너) 영역도 제외.
+    무시 선택자가 바뀌면 방식(scheme)도 바뀌므로 호출 측에서 기준값을 새로 잡을 수 있음.
+    파싱 트리를 수정하므로 문자열을 넘기거나 다른 추출기와 공유하지 않는 문서를 넘길 것.
     """
-    HTML에서 공지 영역 텍스트와 첫 번째 큰 이미지(배너) 추출.
+    soup = as_document(html, url).soup
+    for el in soup.select(_FINGERPRINT_DROP_SELECTOR):
+        el.decompose()
+    ignore = (ignore_selector or "").strip()
+    if ignore:
+        try:
+            for el in soup.select(ignore):
+                el.decompose()
+        except Exception as e:
+            logger.warning("hash_ignore_selector 오류 %r: %s", ignore, e)
+
+    regions = [el for sel in _NOTICE_REGION_SELECTORS for el in soup.select(sel)]
+    if not regions:
+        regions = [soup.body or soup]
+
+    texts: list[str] = []
+    links: set[str] = set()
+    for region in regions:
+        texts.append(" ".join(region.get_text(separator=" ", strip=True).split()))
+        for el in region.find_all(["a", "img"]):
+            link = _stable_link(url, el.get("href") if el.name == "a" else el.get("src"))
+            if link:
+                links.add(link)
+    text = _VOLATILE_TEXT.sub("#", "\n".join(t for t in texts if t))
+    digest = hashlib.sha256("\n".join([text, *sorted(links)]).encode("utf-8", errors="replace")).hexdigest()
+    ignore_tag = hashlib.sha256(ignore.encode("utf-8")).hexdigest()[:8] if ignore else "-"
+    return f"{FINGERPRINT_VERSION}:{ignore_tag}:{digest}"
+
+
+async def get_notice_content_from_html(html: str | HtmlDocument, url: str) -> tuple[str, str]:
+    """
+    HTML(또는 이미 파싱된 HtmlDocument)에서 공지 영역 텍스트와 첫 번째 큰 이미지(배너) 추출.
     반환: (text_content, image_url_or_empty)
     """
-    soup = BeautifulSoup(html, "html.parser")
+    return extract_notice_content(html, url)
+
+
+def extract_notice_content(html: str | HtmlDocument, url: str) -> tuple[str, str]:
+    """get_notice_content_from_html 의 동기 본체. 문자열 HTML이면 parse_pool(run_parse)에서 실행 가능."""
+    soup = as_document(html, url).soup
     text_parts = []
     image_url = ""
 
-    for selector in [
-        "article", ".notice", ".board", ".content", "[class*='notice']",
-        "[class*='event']", "main", ".detail"
-    ]:
+    for selector in _NOTICE_REGION_SELECTORS:
         for el in soup.select(selector):
             text_parts.append(el.get_text(separator=" ", strip=True))
             if not image_url:
@@ -0,0 +1,32 @@
+"""
+한 번 받은 페이지를 한 번만 파싱: HTML 원문 + (필요할 때 만든) BeautifulSoup 을 묶어 모든 추출기에 전달.
+수명은 페이지 하나를 파싱하는 단계 동안 (parse_list_page 등 파싱 단계 함수 안에서 페이지마다 생성).
+"""
+from bs4 import BeautifulSoup
+
+from app.services.crawler.parser import make_soup
+
+
+class HtmlDocument:
+    """페이지 HTML과 파싱 결과. soup 은 처음 접근할 때 한 번만 생성 (parser 없으면 설정된 백엔드)."""
+
+    __slots__ = ("html", "url", "parser", "_soup")
+
+    def __init__(self, html: str, url: str = "", parser: str | None = None) -> None:
+        self.html = html or ""
+        self.url = url
+        self.parser = parser
+        self._soup: BeautifulSoup | None = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = make_soup(self.html, self.parser)
+        return self._soup
+
+
+def as_document(html: "str | HtmlDocument", url: str = "") -> HtmlDocument:
+    """문자열이면 새 HtmlDocument, 이미 문서면 그대로 (추출기들이 둘 다 받도록)."""
+    if isinstance(html, HtmlDocument):
+        return html
+    return HtmlDocument(html, url)
@@ -0,0 +1,129 @@
+"""
+호스트별 수집 단계(tier) 학습: 마지막으로 성공한 단계부터 시도하고, 주기적으로 더 싼 단계를 재시험.
+단계(싼 순): httpx → curl_cffi(chrome) → curl_cffi(safari) → ScraperAPI → 헤드리스 브라우저
+ScraperAPI(유료)·브라우저(풀 슬롯) 단계는 알려진 차단 호스트, 또는 curl 단계까지 fetch_tier_escalate_after 번
+연속 차단된 호스트만 사용 (403 한 번으로 올라가지 않도록).
+프로세스 메모리에만 보관 (재시작 시 다시 학습).
+"""
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from app.config import settings
+
+TIER_HTTPX = "httpx"
+TIER_CURL_CHROME = "curl_chrome"
+TIER_CURL_SAFARI = "curl_safari"
+TIER_SCRAPERAPI = "scraperapi"
+TIER_BROWSER = "browser"
+
+TIERS = (TIER_HTTPX, TIER_CURL_CHROME, TIER_CURL_SAFARI, TIER_SCRAPERAPI, TIER_BROWSER)
+# 비용이 드는 단계 (올라가려면 반복 차단이 필요)
+_COSTLY_TIERS = frozenset({TIER_SCRAPERAPI, TIER_BROWSER})
+
+# Cloudflare 등으로 httpx/curl 이 항상 막히는 것으로 알려진 호스트 → 처음부터 우회 단계로 시작
+KNOWN_BLOCKED_HOSTS = ("jinair.com", "parataair.com", "flyairseoul.com")
+
+_LATENCY_EWMA_ALPHA = 0.3
+
+
+@dataclass
+class HostTierStats:
+    """호스트 하나의 단계별 성공/실패 횟수와 평균 지연(ms)."""
+    tier: str | None = None  # 마지막으로 성공한 단계
+    successes: dict[str, int] = field(default_factory=dict)
+    failures: dict[str, int] = field(default_factory=dict)
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    last_probe_at: float = field(default_factory=time.monotonic)
+    blocked_streak: int = 0  # 싼 단계까지 모두 차단된 연속 요청 수
+
+
+_stats: dict[str, HostTierStats] = {}
+
+
+def host_of(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _available_tiers() -> list[str]:
+    return [t for t in TIERS if t != TIER_SCRAPERAPI or settings.scraper_api_key]
+
+
+def _seed_tier(host: str) -> str:
+    if _known_blocked(host):
+        return TIER_SCRAPERAPI if settings.scraper_api_key else TIER_BROWSER
+    return TIER_HTTPX
+
+
+def _known_blocked(host: str) -> bool:
+    return any(host == h or host.endswith("." + h) for h in KNOWN_BLOCKED_HOSTS)
+
+
+def _may_escalate(host: str, st: HostTierStats) -> bool:
+    return (
+        _known_blocked(host)
+        or st.tier in _COSTLY_TIERS
+        or st.blocked_streak >= max(1, settings.fetch_tier_escalate_after)
+    )
+
+
+def _get(host: str) -> HostTierStats:
+    st = _stats.get(host)
+    if st is None:
+        st = _stats[host] = HostTierStats(tier=_seed_tier(host))
+    return st
+
+
+def tier_plan(url: str) -> list[str]:
+    """
+    이번 요청에서 시도할 단계 순서. 학습된 단계부터 시작해 실패(차단) 시 위 단계로 올라감.
+    fetch_tier_reprobe_seconds 가 지났으면 가장 싼 단계부터 다시 시험.
+    아직 반복 차단되지 않은 호스트는 curl 단계까지만.
+    """
+    host = host_of(url)
+    st = _get(host)
+    available = _available_tiers()
+    if not _may_escalate(host, st):
+        available = [t for t in available if t not in _COSTLY_TIERS]
+    start = st.tier if st.tier in available else available[0]
+    now = time.monotonic()
+    if start != available[0] and now - st.last_probe_at >= settings.fetch_tier_reprobe_seconds:
+        st.last_probe_at = now
+        return available
+    return available[available.index(start):]
+
+
+def record_success(url: str, tier: str, elapsed: float) -> None:
+    st = _get(host_of(url))
+    st.tier = tier
+    if tier not in _COSTLY_TIERS:
+        st.blocked_streak = 0
+    st.successes[tier] = st.successes.get(tier, 0) + 1
+    ms = elapsed * 1000
+    prev = st.latency_ms.get(tier)
+    st.latency_ms[tier] = ms if prev is None else prev + _LATENCY_EWMA_ALPHA * (ms - prev)
+
+
+def record_failure(url: str, tier: str) -> None:
+    st = _get(host_of(url))
+    st.failures[tier] = st.failures.get(tier, 0) + 1
+
+
+def record_blocked(url: str) -> None:
+    """계획한 모든 단계가 차단됨 (fetch_page 에서 호출). 연속 횟수가 쌓이면 비용이 드는 단계 허용."""
+    _get(host_of(url)).blocked_streak += 1
+
+
+def snapshot() -> dict[str, dict]:
+    """관리 API용: 호스트별 학습 상태."""
+    return {
+        host: {
+            "tier": st.tier,
+            "blocked_streak": st.blocked_streak,
+            "successes": dict(st.successes),
+            "failures": dict(st.failures),
+            "latency_ms": {k: round(v, 1) for k, v in st.latency_ms.items()},
+        }
+        for host, st in sorted(_stats.items())
+    }
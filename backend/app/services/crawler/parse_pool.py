@@ -0,0 +1,59 @@
+"""
+CPU 위주 HTML 파싱을 이벤트 루프 밖에서 실행.
+- settings.parse_workers > 0: 프로세스 풀(spawn)에서 실행. 인자/반환은 문자열·튜플 등 pickle 가능한 값만
+- 0(기본): 같은 프로세스의 스레드에서 실행 (이벤트 루프를 오래 막지 않음)
+FastAPI lifespan에서 init_parse_pool() / close_parse_pool() 호출. 호출 전에 쓰면 지연 생성.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor | None:
+    global _executor
+    if settings.parse_workers <= 0:
+        return None
+    if _executor is None:
+        # fork 는 이벤트 루프/스레드 상태까지 복제하므로 spawn 사용
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("HTML parse pool started: %d workers", settings.parse_workers)
+    return _executor
+
+
+async def run_parse(fn: Callable[..., T], *args: Any) -> T:
+    """fn(*args) 를 프로세스 풀(설정 시) 또는 스레드에서 실행. fn 은 모듈 최상위 함수여야 함."""
+    global _executor
+    executor = _get_executor()
+    if executor is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            logger.warning("HTML parse pool is broken, restarting; parsing %s in-process", getattr(fn, "__name__", fn))
+            executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+    return await asyncio.to_thread(fn, *args)
+
+
+def init_parse_pool() -> None:
+    _get_executor()
+
+
+def close_parse_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
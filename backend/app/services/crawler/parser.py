@@ -0,0 +1,39 @@
+"""
+HTML 파서 백엔드 선택. 추출기는 모두 BeautifulSoup/soupsieve API 를 쓰므로 트리 빌더만 교체.
+settings.html_parser: "html.parser"(기본) | "lxml" | "html5lib" | "auto"(lxml 설치 시 lxml, 아니면 html.parser)
+"""
+import importlib.util
+import logging
+from functools import lru_cache
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_PARSER = "html.parser"
+
+# BeautifulSoup 파서 이름 -> 필요한 모듈
+_PARSER_MODULES = {"lxml": "lxml", "html5lib": "html5lib", "html.parser": None}
+
+
+@lru_cache(maxsize=1)
+def parser_backend() -> str:
+    """사용할 BeautifulSoup 파서 이름. 설정한 파서가 설치돼 있지 않으면 html.parser."""
+    name = (settings.html_parser or REFERENCE_PARSER).strip()
+    if name == "auto":
+        return "lxml" if importlib.util.find_spec("lxml") else REFERENCE_PARSER
+    if name not in _PARSER_MODULES:
+        logger.warning("알 수 없는 html_parser '%s', %s 사용", name, REFERENCE_PARSER)
+        return REFERENCE_PARSER
+    module = _PARSER_MODULES[name]
+    if module and importlib.util.find_spec(module) is None:
+        logger.warning("html_parser '%s' 모듈이 없어 %s 사용", name, REFERENCE_PARSER)
+        return REFERENCE_PARSER
+    return name
+
+
+def make_soup(html: str, parser: str | None = None) -> BeautifulSoup:
+    """설정된 백엔드(또는 지정한 parser)로 파싱."""
+    return BeautifulSoup(html, parser or parser_backend())
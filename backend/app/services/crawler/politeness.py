@@ -0,0 +1,140 @@
+"""
+호스트별 요청 속도 제한(token bucket) + 429/Retry-After 백오프.
+- 기본값: settings.crawl_rate_per_second / crawl_burst
+- 항공사별: Airline.crawl_rate_per_second / crawl_burst 로 configure_host() 호출 (run_notice_detection)
+- ScraperAPI 게이트웨이는 대상 사이트와 별개인 자체 호스트(SCRAPERAPI_HOST)로 제한
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCRAPERAPI_HOST = "api.scraperapi.com"
+
+_MAX_BACKOFF_SECONDS = 300.0
+
+
+class RateLimited(Exception):
+    """429(또는 Retry-After 가 붙은 503) 응답. retry_after 초 후 재시도 가능."""
+
+    def __init__(self, retry_after: float | None) -> None:
+        super().__init__(f"rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP-date) → 초."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+
+def _check_limits(rate: float, burst: int) -> None:
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"invalid rate limit: rate={rate}, burst={burst}")
+
+
+class TokenBucket:
+    """초당 rate 개 토큰, 최대 burst 개까지 누적. blocked_until 까지는 토큰이 있어도 대기."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        _check_limits(rate, burst)
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self._lock = asyncio.Lock()
+
+    def configure(self, rate: float, burst: int) -> None:
+        _check_limits(rate, burst)
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        # lock 으로 대기자를 줄 세워 먼저 온 요청이 먼저 토큰을 받음
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, retry_after: float | None) -> float:
+        """Retry-After 가 있으면 그만큼, 없으면 지수 백오프로 호스트 전체를 멈춤. 대기 초 반환."""
+        if retry_after is None:
+            self.backoff = min(_MAX_BACKOFF_SECONDS, self.backoff * 2 if self.backoff else 1.0)
+            delay = self.backoff
+        else:
+            delay = min(_MAX_BACKOFF_SECONDS, retry_after)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.tokens = 0.0
+        return delay
+
+    def reset_backoff(self) -> None:
+        self.backoff = 0.0
+
+
+_buckets: dict[str, TokenBucket] = {}
+
+
+def _default_limits(host: str) -> tuple[float, int]:
+    if host == SCRAPERAPI_HOST:
+        return settings.scraperapi_rate_per_second, settings.scraperapi_burst
+    return settings.crawl_rate_per_second, settings.crawl_burst
+
+
+def _bucket(host: str) -> TokenBucket:
+    bucket = _buckets.get(host)
+    if bucket is None:
+        bucket = _buckets[host] = TokenBucket(*_default_limits(host))
+    return bucket
+
+
+def configure_host(host: str, rate: float | None = None, burst: int | None = None) -> None:
+    """호스트 속도 설정 (None 이면 기본값). 누적된 토큰/백오프 상태는 유지.
+    API 검증(gt=0) 이전에 저장된 0 이하 값은 경고 후 기본값."""
+    default_rate, default_burst = _default_limits(host)
+    if (rate is not None and rate <= 0) or (burst is not None and burst < 1):
+        logger.warning("잘못된 속도 제한 무시 %s: rate=%s, burst=%s", host, rate, burst)
+        rate, burst = None, None
+    _bucket(host).configure(default_rate if rate is None else rate, default_burst if burst is None else burst)
+
+
+async def acquire(host: str) -> None:
+    """host 로 요청 하나 보내기 전에 호출. 토큰이 생기고 백오프가 끝날 때까지 대기."""
+    await _bucket(host).acquire()
+
+
+def penalize(host: str, retry_after: float | None) -> float:
+    return _bucket(host).penalize(retry_after)
+
+
+def record_ok(host: str) -> None:
+    _bucket(host).reset_backoff()
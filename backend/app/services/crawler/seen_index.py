@@ -0,0 +1,85 @@
+"""
+이미 수집한 공지 URL 판별: MonitorUrl 별 최근 URL 창(warm set)을 프로세스 메모리에 유지하고,
+창에 없는 URL만 notices 의 (airline_id, source_url, ...) 유니크 인덱스로 한 번에 조회.
+- 조회 비용은 목록 페이지의 항목 수에만 비례 (누적 공지 수와 무관)
+- 창은 필요할 때 채워지고(지연 로딩) seen_index_window 개를 넘으면 오래된 것부터 제거
+- 공지 삭제(clear-data, 항공사/URL 삭제) 시 invalidate() 로 창 비움
+"""
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.db_models import Notice
+
+
+class _Window:
+    """MonitorUrl 하나의 최근 본 URL (LRU)."""
+
+    __slots__ = ("airline_id", "urls")
+
+    def __init__(self, airline_id: str) -> None:
+        self.airline_id = airline_id
+        self.urls: OrderedDict[str, None] = OrderedDict()
+
+    def touch(self, url: str) -> None:
+        self.urls[url] = None
+        self.urls.move_to_end(url)
+        limit = max(1, settings.seen_index_window)
+        while len(self.urls) > limit:
+            self.urls.popitem(last=False)
+
+
+_windows: dict[str, _Window] = {}
+
+
+def _window(monitor_url_id: str, airline_id: str) -> _Window:
+    w = _windows.get(monitor_url_id)
+    if w is None or w.airline_id != airline_id:
+        w = _windows[monitor_url_id] = _Window(airline_id)
+    return w
+
+
+async def filter_seen(
+    session: AsyncSession,
+    monitor_url_id: str,
+    airline_id: str,
+    urls: list[str],
+) -> set[str]:
+    """urls 중 이미 공지로 저장된 것. 창에 없는 URL만 DB에서 한 번의 IN 쿼리로 확인."""
+    w = _window(monitor_url_id, airline_id)
+    seen: set[str] = set()
+    misses: list[str] = []
+    for u in dict.fromkeys(urls):
+        if u in w.urls:
+            w.urls.move_to_end(u)
+            seen.add(u)
+        else:
+            misses.append(u)
+    if misses:
+        res = await session.execute(
+            select(Notice.source_url).where(Notice.airline_id == airline_id, Notice.source_url.in_(misses))
+        )
+        for (u,) in res.all():
+            w.touch(u)
+            seen.add(u)
+    return seen
+
+
+def remember(monitor_url_id: str, airline_id: str, urls: list[str]) -> None:
+    """새로 저장한 공지 URL을 창에 추가 (커밋 후 호출)."""
+    w = _window(monitor_url_id, airline_id)
+    for u in urls:
+        w.touch(u)
+
+
+def invalidate(monitor_url_id: str | None = None, airline_id: str | None = None) -> None:
+    """MonitorUrl 하나, 항공사 하나의 모든 URL, 또는 (둘 다 None 이면) 전체 창 제거."""
+    if monitor_url_id is not None:
+        _windows.pop(monitor_url_id, None)
+    elif airline_id is not None:
+        for key in [k for k, w in _windows.items() if w.airline_id == airline_id]:
+            del _windows[key]
+    else:
+        _windows.clear()
@@ -1,18 +1,34 @@
 """
 범용 크롤러: DB에 저장된 list_link_selector / detail_title_selector 또는 자동 추정으로 목록→상세 또는 단일 페이지 hash 비교.
 """
+import asyncio
+import logging
 from collections import Counter
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
-from sqlalchemy import select
+import soupsieve as sv
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.db_models import Airline, MonitorUrl, Notice
+from app.config import settings
+from app.models.db_models import Airline, MonitorUrl, Notice, gen_uuid
+from app.services.dates import best_period, best_periods
 
+from app.services.crawler import seen_index
 from app.services.crawler.base import CrawlResult
-from app.services.crawler.common import compute_hash, fetch_html, get_notice_content_from_html
+from app.services.crawler.common import (
+    compute_content_fingerprint,
+    compute_hash,
+    extract_notice_content,
+    fetch_html,
+    fingerprint_scheme,
+)
+from app.services.crawler.document import HtmlDocument, as_document
+from app.services.crawler.parse_pool import run_parse
+
+logger = logging.getLogger(__name__)
 
 
 def _normalize_link_selector(value: str) -> str:
@@ -29,9 +45,9 @@ def _normalize_link_selector(value: str) -> str:
     return s
 
 
-def _extract_detail_links(html: str, list_url: str, selector: str) -> list[str]:
+def _extract_detail_links(html: str | HtmlDocument, list_url: str, selector: str) -> list[str]:
     """목록 페이지 HTML에서 상세 페이지 링크 추출 (절대 URL)."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = as_document(html, list_url).soup
     urls: list[str] = []
     resolved = _normalize_link_selector(selector)
     if not resolved:
@@ -79,28 +95,98 @@ def _normalize_title_selector(value: str | None) -> str | None:
     return s
 
 
-def _extract_detail_title(html: str, title_selector: str | None = None) -> str:
-    """상세 페이지 HTML에서 제목 추출."""
-    soup = BeautifulSoup(html, "html.parser")
+def _compile_selector(css: str | None) -> sv.SoupSieve | None:
+    """CSS 선택자 컴파일. 비었거나 문법 오류면 None (기존처럼 해당 선택자는 매칭 없음으로 취급)."""
+    if not css:
+        return None
+    try:
+        return sv.compile(css)
+    except Exception as e:
+        logger.warning("선택자 컴파일 실패 %r: %s", css, e)
+        return None
+
+
+_CHAKRA_TITLE = sv.compile("h1.chakra-text")
 
-    def _text_from_selector(sel: str) -> str | None:
+
+@dataclass(frozen=True)
+class CompiledSelectors:
+    """MonitorUrl 선택자(정규화 후 컴파일). pickle 가능하므로 parse_pool 프로세스에도 그대로 전달."""
+    link_css: str  # 정규화된 목록 선택자 (브라우저 wait_selector 용)
+    link: sv.SoupSieve | None
+    title: sv.SoupSieve | None  # 목록 항목 안의 제목
+    period: sv.SoupSieve | None
+    next: sv.SoupSieve | None
+    detail_title_css: str | None  # 정규화된 상세 제목 선택자 (wait_selector 용)
+    detail_title: sv.SoupSieve | None
+
+
+def compile_selectors(
+    list_selector: str | None,
+    title_selector: str | None,
+    period_selector: str | None = None,
+    next_selector: str | None = None,
+) -> CompiledSelectors:
+    """선택자 문자열들을 정규화·컴파일 (캐시 없음)."""
+    link_css = _normalize_link_selector(list_selector or "")
+    title = (title_selector or "").strip()
+    detail_title_css = _normalize_title_selector(title) if title else None
+    return CompiledSelectors(
+        link_css=link_css,
+        link=_compile_selector(link_css),
+        title=_compile_selector(_normalize_link_selector(title)),
+        period=_compile_selector(_normalize_link_selector(period_selector) if period_selector else None),
+        next=_compile_selector((next_selector or "").strip() or None),
+        detail_title_css=detail_title_css,
+        detail_title=_compile_selector(detail_title_css),
+    )
+
+
+# MonitorUrl.id -> (원본 선택자 튜플, 컴파일 결과). update_monitor_url 등에서 invalidate_selector_cache() 로 제거
+_selector_cache: dict[str, tuple[tuple, CompiledSelectors]] = {}
+
+
+def selectors_for(row: MonitorUrl) -> CompiledSelectors:
+    """MonitorUrl 의 컴파일된 선택자 (페이지·사이클 간 재사용). 원본 문자열이 달라졌으면 다시 컴파일."""
+    raw = (row.list_link_selector, row.detail_title_selector, row.list_period_selector, row.list_next_selector)
+    cached = _selector_cache.get(row.id)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    compiled = compile_selectors(*raw)
+    _selector_cache[row.id] = (raw, compiled)
+    return compiled
+
+
+def invalidate_selector_cache(monitor_url_id: str | None = None) -> None:
+    """MonitorUrl 하나(또는 None 이면 전체)의 컴파일된 선택자 제거."""
+    if monitor_url_id is None:
+        _selector_cache.clear()
+    else:
+        _selector_cache.pop(monitor_url_id, None)
+
+
+def _extract_detail_title(html: str | HtmlDocument, title_selector: sv.SoupSieve | None = None) -> str:
+    """상세 페이지 HTML에서 제목 추출. title_selector 는 CompiledSelectors.detail_title."""
+    doc = as_document(html)
+    soup = doc.soup
+
+    def _text_from_selector(sel: sv.SoupSieve) -> str | None:
         try:
-            els = soup.select(sel)
-            if els:
-                t = els[0].get_text(strip=True)
+            el = sel.select_one(soup)
+            if el is not None:
+                t = el.get_text(strip=True)
                 if t:
                     return t[:500]
         except Exception:
             pass
         return None
 
-    sel = _normalize_title_selector(title_selector) if title_selector else None
-    if sel:
-        t = _text_from_selector(sel)
+    if title_selector is not None:
+        t = _text_from_selector(title_selector)
         if t:
             return t
-    if "chakra-text" in html:
-        t = _text_from_selector("h1.chakra-text")
+    if "chakra-text" in doc.html:
+        t = _text_from_selector(_CHAKRA_TITLE)
         if t:
             return t
     if soup.title and soup.title.string:
@@ -151,51 +237,28 @@ def get_link_from_el(el, list_url: str):
 
 
 def parse_event_period(text: str) -> tuple[datetime | None, datetime | None]:
-    if not text:
-        return None, None
-    import re
-    # match patterns like "2026.01.01", "26.01.01", "01.01", "2026/01/01", "2026-01-01"
-    pattern = r'(?:(?:20)?(\d{2})[./-])?(\d{1,2})[./-](\d{1,2})'
-    matches = re.findall(pattern, text)
-    if len(matches) >= 2:
-        try:
-            from datetime import timezone
-            start_y, start_m, start_d = matches[0]
-            end_y, end_m, end_d = matches[1]
-            
-            curr_year = datetime.utcnow().year
-            sy = 2000 + int(start_y) if start_y else curr_year
-            ey = 2000 + int(end_y) if end_y else curr_year
-            
-            if not start_y and not end_y and int(start_m) > int(end_m):
-                ey += 1
-            
-            start_dt = datetime(sy, int(start_m), int(start_d), tzinfo=timezone.utc)
-            end_dt = datetime(ey, int(end_m), int(end_d), 23, 59, 59, tzinfo=timezone.utc)
-            return start_dt, end_dt
-        except ValueError:
-            pass
-    return None, None
+    """목록의 기간 텍스트 → (시작, 끝). app.services.dates 엔진 사용."""
+    return best_period(text or "")
 
 
 def extract_links_and_titles_from_list_page(
-    html: str,
+    html: str | HtmlDocument,
     list_url: str,
-    list_selector: str,
-    title_selector: str,
-    period_selector: str | None = None,
+    selectors: CompiledSelectors,
     container_tag: str = "parent",
 ) -> list[tuple[str, str, str | None]]:
     """
-    목록 페이지에서 (상세 URL, 제목, 기간텍스트) 쌍 추출.
+    목록 페이지에서 (상세 URL, 제목, 기간텍스트) 쌍 추출. 이미 파싱된 HtmlDocument 를 넘기면 재파싱 안 함.
+    selectors: selectors_for(row) 또는 compile_selectors() 결과.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    resolved_list = _normalize_link_selector(list_selector)
-    title_sel = _normalize_link_selector(title_selector)
-    period_sel = _normalize_link_selector(period_selector) if period_selector else None
+    soup = as_document(html, list_url).soup
+    title_sel = selectors.title
+    period_sel = selectors.period
     result: list[tuple[str, str, str | None]] = []
+    if selectors.link is None:
+        return result
     try:
-        elements = soup.select(resolved_list)
+        elements = selectors.link.select(soup)
         for el in elements:
             href = get_link_from_el(el, list_url)
             if not href or not href.startswith("http"):
@@ -206,8 +269,8 @@ def extract_links_and_titles_from_list_page(
             else:
                 container = el
             
-            title_el = container.select_one(title_sel) if title_sel else None
-            period_el = container.select_one(period_sel) if period_sel else None
+            title_el = title_sel.select_one(container) if title_sel else None
+            period_el = period_sel.select_one(container) if period_sel else None
             
             period_text = period_el.get_text(separator=" ", strip=True) if period_el else None
 
@@ -227,6 +290,53 @@ def extract_links_and_titles_from_list_page(
     return result
 
 
+def parse_list_page(
+    html: str,
+    page_url: str,
+    selectors: CompiledSelectors,
+) -> tuple[list[tuple[str, str, str | None]], str | None]:
+    """
+    목록 페이지 한 장을 한 번만 파싱해 ((상세 URL, 제목, 기간텍스트) 목록, 다음 페이지 URL) 반환.
+    인자/결과가 모두 pickle 가능하므로 parse_pool 프로세스에서 실행 가능.
+    """
+    doc = HtmlDocument(html, page_url)
+    items = extract_links_and_titles_from_list_page(doc, page_url, selectors)
+    next_href = None
+    if selectors.next is not None:
+        next_btn = selectors.next.select_one(doc.soup)
+        next_href = get_link_from_el(next_btn, page_url) if next_btn else None
+    return items, next_href
+
+
+_INSERT_BATCH_SIZE = 500
+
+
+async def _insert_notices(session: AsyncSession, rows: list[dict]) -> list[tuple[str, str]]:
+    """
+    공지 여러 건을 배치 INSERT (유니크 키 충돌은 무시). 실제로 들어간 (id, source_url) 목록 반환.
+    created_at 은 rows 순서대로 1µs 씩 증가시켜 저장 순서(오래된 것 먼저)를 유지.
+    """
+    if not rows:
+        return []
+    now = datetime.utcnow()
+    inserted: list[tuple[str, str]] = []
+    for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+        batch = [
+            {"id": gen_uuid(), "created_at": now + timedelta(microseconds=start + i), **r}
+            for i, r in enumerate(rows[start:start + _INSERT_BATCH_SIZE])
+        ]
+        stmt = pg_insert(Notice).values(batch).on_conflict_do_nothing().returning(Notice.id, Notice.source_url)
+        res = await session.execute(stmt)
+        inserted.extend((notice_id, u) for notice_id, u in res.all())
+    return inserted
+
+
+def _forget_validators(row: MonitorUrl) -> None:
+    """다음 크롤링이 조건부 GET(304)으로 건너뛰지 않도록 검증자를 비움."""
+    row.http_etag = None
+    row.http_last_modified = None
+
+
 class UniversalCrawler:
     """단일 웹 컴포넌트 경로로 목록 및 상세 페이지 크롤링 수행."""
 
@@ -239,38 +349,49 @@ class UniversalCrawler:
         airline_name: str,
     ) -> list[CrawlResult]:
         result: list[CrawlResult] = []
-        new_hash = compute_hash(html)
         now = datetime.utcnow()
 
         selector = (row.list_link_selector or "").strip()
-        title_selector = (row.detail_title_selector or "").strip()
 
         if selector:
+            new_hash = compute_hash(html)
             part = await self._crawl_list_detail(
-                session, row, html, airline_id, airline_name, selector, title_selector
+                session, row, html, airline_id, airline_name, selectors_for(row)
             )
             result.extend(part)
         else:
+            if settings.single_page_fingerprint == "content":
+                new_hash = await run_parse(compute_content_fingerprint, html, row.url, row.hash_ignore_selector)
+            else:
+                new_hash = compute_hash(html)
             is_first = row.last_html_hash is None
-            is_changed = row.last_html_hash is not None and row.last_html_hash != new_hash
+            # 지문 방식(또는 무시 선택자)이 바뀐 직후에는 비교할 수 없으므로 공지 없이 기준값만 교체
+            rebaseline = not is_first and fingerprint_scheme(row.last_html_hash) != fingerprint_scheme(new_hash)
+            if rebaseline:
+                logger.info("단일 페이지 지문 방식 변경, 기준값 갱신: %s", row.url)
+            is_changed = not is_first and not rebaseline and row.last_html_hash != new_hash
             if is_first or is_changed:
-                text_content, image_url = await get_notice_content_from_html(html, row.url)
+                text_content, image_url = await run_parse(extract_notice_content, html, row.url)
                 if image_url and len(text_content) < 200:
                     content_type = "image"
                     raw_content = image_url
                 else:
                     content_type = "text"
                     raw_content = text_content or html[:50000]
-                notice = Notice(
-                    airline_id=airline_id,
-                    source_url=row.url,
-                    content_type=content_type,
-                    raw_content=raw_content,
-                    is_special_deal=False,
-                )
-                session.add(notice)
-                await session.flush()
-                result.append((airline_id, airline_name, row.url, content_type, raw_content))
+                inserted = await _insert_notices(session, [{
+                    "airline_id": airline_id,
+                    "source_url": row.url,
+                    "fingerprint": new_hash,
+                    "content_type": content_type,
+                    "raw_content": raw_content,
+                    "is_special_deal": False,
+                }])
+                # (항공사, URL, 지문) 유니크 키: A → B → A 처럼 전에 저장한 내용으로 되돌아간 경우는
+                # 이미 있는 공지이므로 새로 만들지 않음 (의도된 동작)
+                if not inserted:
+                    logger.info("이전에 저장한 내용으로 되돌아감, 새 공지 없음: %s", row.url)
+                for notice_id, _ in inserted:
+                    result.append((notice_id, airline_id, airline_name, row.url))
 
         row.last_html_hash = new_hash
         row.last_checked_at = now
@@ -283,16 +404,18 @@ class UniversalCrawler:
         html: str,
         airline_id: str,
         airline_name: str,
-        selector: str,
-        title_selector: str,
+        selectors: CompiledSelectors,
     ) -> list[CrawlResult]:
         result: list[CrawlResult] = []
         
-        existing = await session.execute(
-            select(Notice.source_url).where(Notice.airline_id == airline_id)
-        )
-        seen = {r[0] for r in existing.fetchall()}
-        
+        # 이 사이클에 본 목록 항목 중 이미 저장된 URL (페이지마다 seen_index 로 확인)
+        seen: set[str] = set()
+        # 처리하지 못한 항목(다음 페이지·상세 수집 실패, 예산 초과)이 있으면 검증자를 저장하지 않음
+        incomplete = False
+        # 이전 사이클에 상세 제목을 못 구해 미룬 항목 {URL: (기간 텍스트, 상세 조회 실패 횟수)}.
+        # 목록 페이지를 어디까지 넘기든 매번 다시 시도
+        pending = {u: (p, rest[0] if rest else 0) for u, p, *rest in (row.pending_detail_items or [])}
+
         list_page_norm = _normalize_url(row.url)
         all_items = []
         current_html = html
@@ -302,10 +425,8 @@ class UniversalCrawler:
         
         while current_html and pages_crawled < max_pages:
             pages_crawled += 1
-            # 1. 목록 페이지에서 (URL, 제목, 기간) 추출 시도
-            page_items = extract_links_and_titles_from_list_page(
-                current_html, current_url, selector, title_selector, row.list_period_selector
-            )
+            # 1. 목록 페이지에서 (URL, 제목, 기간) + 다음 페이지 링크를 한 번의 파싱으로 추출 (parse_pool)
+            page_items, next_href = await run_parse(parse_list_page, current_html, current_url, selectors)
             
             valid_items = [(u, t, p) for u, t, p in page_items if _normalize_url(u) != list_page_norm]
             if not valid_items:
@@ -313,60 +434,110 @@ class UniversalCrawler:
                 
             all_items.extend(valid_items)
             
-            found_existing = any(u in seen for u, t, p in valid_items)
-            if found_existing:
+            page_seen = await seen_index.filter_seen(session, row.id, airline_id, [u for u, _, _ in valid_items])
+            seen |= page_seen
+            if page_seen:
                 break
                 
-            if row.list_next_selector:
-                soup = BeautifulSoup(current_html, "html.parser")
-                next_btn = soup.select_one(row.list_next_selector)
-                next_href = get_link_from_el(next_btn, current_url) if next_btn else None
-                if next_href and _normalize_url(next_href) != _normalize_url(current_url):
-                    current_url = next_href
-                    current_html = await fetch_html(current_url)
-                else:
-                    break
+            if next_href and _normalize_url(next_href) != _normalize_url(current_url):
+                current_url = next_href
+                current_html = await fetch_html(current_url, wait_selector=selectors.link_css or None)
+                if not current_html:
+                    incomplete = True
             else:
                 break
         
         # 자기 자신 링크 등 제외하고, 최신 항목(HTML 상단)이 나중에 DB에 들어가도록 순서를 뒤집음
         items_to_process = all_items
         items_to_process.reverse()
+        # 이번에 목록에서 다시 보지 못한 미룬 항목은 가장 오래된 것으로 앞에 둠 (그 사이 저장됐으면 seen 으로 제외)
+        listed = {u for u, _, _ in items_to_process}
+        carried = [(u, "", p) for u, (p, _) in pending.items() if u not in listed]
+        if carried:
+            seen |= await seen_index.filter_seen(session, row.id, airline_id, [u for u, _, _ in carried])
+            items_to_process = carried + items_to_process
         
         if not items_to_process:
+            if incomplete:
+                _forget_validators(row)
             return result
-        
-        for detail_url, list_title, period_text in items_to_process:
+
+        # 2. 목록 페이지에서 제목 추출 실패한 항목은 상세 페이지를 동시에 방문
+        #    (crawl_detail_budget 건: 전에 미룬 항목 먼저, 남은 예산은 최신 항목부터)
+        need_detail: list[str] = []
+        for detail_url, list_title, _ in items_to_process:
+            if detail_url not in seen and (list_title == "공지" or not list_title) and detail_url not in need_detail:
+                need_detail.append(detail_url)
+        budget = max(0, settings.crawl_detail_budget)
+        to_fetch = [u for u in need_detail if u in pending][:budget]
+        rest = budget - len(to_fetch)
+        if rest:
+            to_fetch += [u for u in need_detail if u not in pending][-rest:]
+        if len(to_fetch) < len(need_detail):
+            logger.info("상세 제목 조회 예산 초과, %d건은 다음 사이클로: %s", len(need_detail) - len(to_fetch), row.url)
+        detail_titles = await self._fetch_detail_titles(to_fetch, selectors)
+        tried = set(to_fetch)
+
+        # 기간 텍스트는 한 번의 배치 호출로 해석
+        periods = best_periods([p for _, _, p in items_to_process])
+        rows: list[dict] = []
+        still_pending: dict[str, tuple[str | None, int]] = {}
+        max_attempts = max(1, settings.crawl_detail_max_attempts)
+        for (detail_url, list_title, period_text), (start_dt, end_dt) in zip(items_to_process, periods):
             if detail_url in seen:
                 continue
-                
+
             title = list_title
-            
-            # 2. 목록 페이지에서 제목 추출 실패 시 상세 페이지 방문
             if title == "공지" or not title:
-                detail_html = await fetch_html(detail_url)
-                if not detail_html:
-                    continue
-                title = _extract_detail_title(detail_html, title_selector)
-                
+                title = detail_titles.get(detail_url)
+                if title is None:
+                    # 상세 수집 실패 또는 예산 초과 → 저장하지 않고 row 에 남겨 다음 사이클에 재시도.
+                    # crawl_detail_max_attempts 번 실패하면(삭제된 글 등) 목록 제목으로 저장하고 끝냄
+                    attempts = pending.get(detail_url, (None, 0))[1] + (detail_url in tried)
+                    if attempts < max_attempts:
+                        still_pending[detail_url] = (period_text, attempts)
+                        continue
+                    logger.warning("상세 제목 조회 %d회 실패, 목록 제목으로 저장: %s", attempts, detail_url)
+                    title = list_title
+
             if not title:
                 title = "공지"
 
-            start_dt, end_dt = parse_event_period(period_text)
-
-            notice = Notice(
-                airline_id=airline_id,
-                source_url=detail_url,
-                content_type="text",
-                raw_content=title,
-                extracted_text=title,
-                is_special_deal=False,
-                event_start=start_dt,
-                event_end=end_dt,
-            )
-            session.add(notice)
-            await session.flush()
-            result.append((airline_id, airline_name, detail_url, "text", title))
+            rows.append({
+                "airline_id": airline_id,
+                "source_url": detail_url,
+                "content_type": "text",
+                "raw_content": title,
+                "extracted_text": title,
+                "is_special_deal": False,
+                "event_start": start_dt,
+                "event_end": end_dt,
+            })
             seen.add(detail_url)
-            
+
+        row.pending_detail_items = [[u, p, n] for u, (p, n) in still_pending.items()] or None
+        if incomplete or still_pending:
+            _forget_validators(row)
+
+        # 3. 한 번에 INSERT ... ON CONFLICT DO NOTHING: 겹쳐 실행된 다른 크롤링이 먼저 넣은 URL은 건너뜀
+        inserted = dict((u, notice_id) for notice_id, u in await _insert_notices(session, rows))
+        for r in rows:
+            notice_id = inserted.get(r["source_url"])
+            if notice_id:
+                result.append((notice_id, airline_id, airline_name, r["source_url"]))
         return result
+
+    async def _fetch_detail_titles(self, urls: list[str], selectors: CompiledSelectors) -> dict[str, str]:
+        """상세 페이지들을 crawl_detail_concurrency 개씩 동시에 받아 제목 추출. 실패한 URL은 결과에 없음."""
+        sem = asyncio.Semaphore(max(1, settings.crawl_detail_concurrency))
+        wait_selector = selectors.detail_title_css
+
+        async def one(url: str) -> tuple[str, str | None]:
+            async with sem:
+                detail_html = await fetch_html(url, wait_selector=wait_selector)
+            if not detail_html:
+                return url, None
+            return url, await run_parse(_extract_detail_title, detail_html, selectors.detail_title)
+
+        pairs = await asyncio.gather(*(one(u) for u in urls))
+        return {u: t for u, t in pairs if t is not None}
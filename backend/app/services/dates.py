@@ -0,0 +1,196 @@
+"""
+행사 기간 추출 엔진: 본문을 정규식 하나로 한 번만 훑어 날짜 토큰을 찾고, 토큰 사이 문자열로 기간을 묶음.
+- 날짜 토큰: 2026.01.05 / 26-1-5 / 2026/1/5 / 1.5 / 01-05 / 2026년 1월 5일 / 1월 5일
+- 묶음: "A ~ B"(요일·시각 허용: "(월)", ".(월)", "23:59", "오전 10시", "자정"), "A 까지", "A ~"(시작만),
+  기호가 섞인 "A) ~ (B". 쉼표·빗금·공백만 있는 두 날짜("3/2, 3/9")는 기간이 아님
+- 후보마다 위치(span)와 신뢰도(confidence). best_period() 는 신뢰도가 가장 높은(같으면 앞선) 후보
+- 연도가 없으면 reference(기본: 현재) 연도, 끝이 시작보다 앞이면 다음 해
+공지 분석(analyzer)과 목록 기간 텍스트(universal.parse_event_period)가 함께 사용.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+# 날짜 토큰 하나. 숫자형은 연·월·일 구분자가 같아야 함 ("01.01-01.31" 을 2001-01-01 로 읽지 않도록)
+_DATE_TOKEN = re.compile(
+    r"""
+    (?<!\d)
+    (?:
+        (?:(?P<ko_y>\d{4})\s*년\s*)?(?P<ko_m>\d{1,2})\s*월\s*(?P<ko_d>\d{1,2})\s*일
+      | (?P<n_y>\d{4}|\d{2})\s*(?P<sep>[./-])\s*(?P<n_m>\d{1,2})\s*(?P=sep)\s*(?P<n_d>\d{1,2})
+      | (?P<md_m>\d{1,2})\s*[./-]\s*(?P<md_d>\d{1,2})
+    )
+    (?!\d)
+    """,
+    re.VERBOSE,
+)
+
+# 날짜 뒤에 붙을 수 있는 요일 "(목)" / ".(목)" 과 시각 "23:59" / "오후 3시 30분" / "자정"
+_TIME = r"(?:(?:오전|오후|새벽|낮|밤)\s*)?(?:\d{1,2}:\d{2}(?::\d{2})?|\d{1,2}\s*시(?:\s*\d{1,2}\s*분)?)|자정|정오"
+_SUFFIX = r"\.?\s*(?:\([^)\d]{0,6}\))?\s*(?:" + _TIME + r")?\s*"
+_RANGE_GAP = re.compile(_SUFFIX + r"(?:[-~～–—]|부터)\s*")
+_UNTIL = re.compile(_SUFFIX + r"까지")
+_OPEN_START = re.compile(_SUFFIX + r"[-~～–—]")
+# 요일·시각 외의 기호가 섞인 기간 ("1.5) ~ (1.10"). 기간 표시(~, -, 부터/까지)가 있어야 함: "3/2, 3/9" 는 날짜 두 개
+_ADJACENT_GAP = re.compile(r"[^\w]{0,4}(?:[-~～–—]|부터|까지)[^\w]{0,4}")
+
+# 신뢰도 (원래 DATE_PATTERNS 우선순위를 보존: 연도 있는 기간 > 연도 있는 "까지" > 연도 없는 기간 > ...)
+CONF_RANGE_FULL_YEAR = 0.95
+CONF_RANGE_ONE_YEAR = 0.9
+CONF_UNTIL_YEAR = 0.85
+CONF_RANGE_NO_YEAR = 0.75
+CONF_UNTIL_NO_YEAR = 0.65
+CONF_START_YEAR = 0.55
+CONF_START_NO_YEAR = 0.45
+CONF_ADJACENT_PENALTY = 0.2  # 기호가 섞인 기간 표시를 기간으로 볼 때 감점
+CONF_SINGLE_YEAR = 0.3
+CONF_SINGLE_NO_YEAR = 0.15
+
+# 공지 본문 기본 기준: 시작만 있는 기간까지 채택, 날짜 하나만 있는 경우는 제외
+DEFAULT_MIN_CONFIDENCE = CONF_START_NO_YEAR
+
+
+@dataclass(frozen=True)
+class DatePeriod:
+    """본문에서 찾은 기간 후보. start/end 중 하나는 None 일 수 있음."""
+    start: datetime | None
+    end: datetime | None
+    span: tuple[int, int]  # 본문에서의 위치 [시작, 끝)
+    confidence: float
+
+
+@dataclass(frozen=True)
+class _Token:
+    start: int
+    end: int
+    year: int | None
+    month: int
+    day: int
+
+
+def _to_year(raw: str | None) -> int | None:
+    if not raw:
+        return None
+    y = int(raw)
+    return 2000 + y if y < 100 else y
+
+
+def _tokens(text: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    for m in _DATE_TOKEN.finditer(text):
+        if m.group("ko_m"):
+            y, mo, d = _to_year(m.group("ko_y")), m.group("ko_m"), m.group("ko_d")
+        elif m.group("n_m"):
+            y, mo, d = _to_year(m.group("n_y")), m.group("n_m"), m.group("n_d")
+        else:
+            y, mo, d = None, m.group("md_m"), m.group("md_d")
+        mo, d = int(mo), int(d)
+        if 1 <= mo <= 12 and 1 <= d <= 31:
+            tokens.append(_Token(m.start(), m.end(), y, mo, d))
+    return tokens
+
+
+def _day(year: int, tok: _Token, end_of_day: bool) -> datetime | None:
+    try:
+        if end_of_day:
+            return datetime(year, tok.month, tok.day, 23, 59, 59, tzinfo=timezone.utc)
+        return datetime(year, tok.month, tok.day, tzinfo=timezone.utc)
+    except ValueError:  # 2월 30일 등
+        return None
+
+
+def _range(a: _Token, b: _Token, ref_year: int, confidence: float) -> DatePeriod | None:
+    sy = a.year if a.year is not None else (b.year if b.year is not None else ref_year)
+    ey = b.year if b.year is not None else sy
+    if b.year is None and (b.month, b.day) < (a.month, a.day):
+        ey += 1  # 12.20 ~ 1.10
+    if a.year is None and b.year is not None and (a.month, a.day) > (b.month, b.day):
+        sy -= 1
+    start, end = _day(sy, a, False), _day(ey, b, True)
+    if start is None or end is None or end < start:
+        return None
+    return DatePeriod(start, end, (a.start, b.end), confidence)
+
+
+def extract_periods(text: str, reference: datetime | None = None) -> list[DatePeriod]:
+    """text 의 모든 기간 후보 (위치 순). 날짜 토큰 스캔 1회 + 토큰 사이 문자열 검사."""
+    if not text:
+        return []
+    ref_year = (reference or datetime.now(timezone.utc)).year
+    tokens = _tokens(text)
+    periods: list[DatePeriod] = []
+    i = 0
+    while i < len(tokens):
+        a = tokens[i]
+        b = tokens[i + 1] if i + 1 < len(tokens) else None
+        if b is not None:
+            gap = text[a.end:b.start]
+            if _RANGE_GAP.fullmatch(gap):
+                years = (a.year is not None) + (b.year is not None)
+                conf = (CONF_RANGE_NO_YEAR, CONF_RANGE_ONE_YEAR, CONF_RANGE_FULL_YEAR)[years]
+                p = _range(a, b, ref_year, conf)
+                if p is not None:
+                    periods.append(p)
+                    i += 2
+                    continue
+            elif _ADJACENT_GAP.fullmatch(gap):
+                years = (a.year is not None) + (b.year is not None)
+                conf = (CONF_RANGE_NO_YEAR, CONF_RANGE_ONE_YEAR, CONF_RANGE_FULL_YEAR)[years] - CONF_ADJACENT_PENALTY
+                p = _range(a, b, ref_year, conf)
+                if p is not None:
+                    periods.append(p)
+                    i += 2
+                    continue
+        year = a.year if a.year is not None else ref_year
+        until = _UNTIL.match(text, a.end)
+        if until:
+            end = _day(year, a, True)
+            if end is not None:
+                conf = CONF_UNTIL_YEAR if a.year is not None else CONF_UNTIL_NO_YEAR
+                periods.append(DatePeriod(None, end, (a.start, until.end()), conf))
+        elif _OPEN_START.match(text, a.end):
+            start = _day(year, a, False)
+            if start is not None:
+                conf = CONF_START_YEAR if a.year is not None else CONF_START_NO_YEAR
+                periods.append(DatePeriod(start, None, (a.start, a.end), conf))
+        else:
+            start = _day(year, a, False)
+            if start is not None:
+                conf = CONF_SINGLE_YEAR if a.year is not None else CONF_SINGLE_NO_YEAR
+                periods.append(DatePeriod(start, None, (a.start, a.end), conf))
+        i += 1
+    return periods
+
+
+def best_period(
+    text: str,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    reference: datetime | None = None,
+) -> tuple[datetime | None, datetime | None]:
+    """가장 그럴듯한 (시작, 끝). min_confidence 이상인 후보가 없으면 (None, None).
+
+    >>> ref = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    >>> [d.date().isoformat() for d in best_period("01-05 ~ 01-10", reference=ref)]
+    ['2026-01-05', '2026-01-10']
+    >>> [d.date().isoformat() for d in best_period("2026.1.5.(월) ~ 1.10.(금)", reference=ref)]
+    ['2026-01-05', '2026-01-10']
+    >>> [d.date().isoformat() for d in best_period("특가 항공권 판매 2026.1.5 (월) 오전 10시 ~ 1.10 (금) 자정", reference=ref)]
+    ['2026-01-05', '2026-01-10']
+    >>> best_period("예매 3/2, 3/9 두차례", reference=ref)
+    (None, None)
+    """
+    best: DatePeriod | None = None
+    for p in extract_periods(text, reference):
+        if p.confidence >= min_confidence and (best is None or p.confidence > best.confidence):
+            best = p
+    return (best.start, best.end) if best else (None, None)
+
+
+def best_periods(
+    texts: list[str | None],
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    reference: datetime | None = None,
+) -> list[tuple[datetime | None, datetime | None]]:
+    """best_period 의 배치 버전. 결과는 texts 와 같은 순서."""
+    reference = reference or datetime.now(timezone.utc)
+    return [best_period(t or "", min_confidence, reference) for t in texts]
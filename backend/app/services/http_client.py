@@ -0,0 +1,200 @@
+"""
+공용 HTTP 클라이언트 레지스트리: 크롤러·가격 크롤러·관리 API가 같은 커넥션 풀을 재사용.
+- FastAPI lifespan에서 init_http_clients() / close_http_clients() 호출
+- HTTP/2(h2 설치 시), keep-alive, 호스트별 동시 연결 제한, DNS 캐시
+- lifespan 밖(스크립트 등)에서 호출해도 get_http_client()가 지연 생성
+"""
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import socket
+import time
+from typing import Any, AsyncIterator, Callable
+
+import httpcore
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 이름 -> 클라이언트. "default": 일반 크롤링/관리 API, "scraper": ScraperAPI 경유(render 대기로 타임아웃 김)
+_clients: dict[str, httpx.AsyncClient] = {}
+# impersonate -> curl_cffi AsyncSession (403 우회용, 세션도 재사용)
+_curl_sessions: dict[str, Any] = {}
+
+SCRAPER_API_TIMEOUT_SECONDS = 60.0
+
+
+class _CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """getaddrinfo 결과(주소 전체)를 TTL 동안 캐시하는 네트워크 백엔드. TLS SNI는 원래 호스트명으로 유지됨.
+    연결은 주소를 차례로 시도 (IPv4 전용 환경의 AAAA 우선 응답, 죽은 주소 하나 대비)."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float) -> None:
+        self._backend = backend
+        self._ttl = ttl
+        self._cache: dict[tuple[str, int], tuple[list[str], float]] = {}
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        cached = self._cache.get((host, port))
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        ips = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._cache[(host, port)] = (ips, time.monotonic() + self._ttl)
+        return ips
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        ips = await self._resolve(host, port)
+        error: Exception = OSError(f"no address for {host}")
+        for ip in ips:
+            try:
+                stream = await self._backend.connect_tcp(
+                    ip, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout, OSError) as e:
+                error = e
+                continue
+            if ip != ips[0] and (host, port) in self._cache:
+                # 연결된 주소를 앞으로: 같은 TTL 동안 죽은 주소를 먼저 시도하지 않음
+                ips.remove(ip)
+                ips.insert(0, ip)
+            return stream
+        # 모든 주소 실패: DNS 응답이 바뀌었을 수 있으므로 다음 연결에서 다시 조회
+        self._cache.pop((host, port), None)
+        raise error
+
+    async def connect_unix_socket(self, path: str, timeout: float | None = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """응답 본문을 다 읽고 닫힐 때 호스트 슬롯을 반납."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """httpx 기본 transport + 호스트별 동시 요청 수 제한 + DNS 캐시."""
+
+    def __init__(self, max_per_host: int, dns_ttl: float, **kwargs: Any) -> None:
+        self._inner = httpx.AsyncHTTPTransport(**kwargs)
+        self._max_per_host = max(1, max_per_host)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # httpcore 내부 속성 (requirements.txt 에서 httpcore 버전 고정). 없으면 DNS 캐시 없이 동작
+        pool = getattr(self._inner, "_pool", None)
+        if dns_ttl > 0 and pool is not None and hasattr(pool, "_network_backend"):
+            pool._network_backend = _CachingDNSBackend(pool._network_backend, dns_ttl)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        await sem.acquire()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            sem.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, sem.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _http2_available() -> bool:
+    if not settings.http2_enabled:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("h2 패키지가 없어 HTTP/1.1로 동작합니다. (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    transport = _PooledTransport(
+        max_per_host=settings.http_max_connections_per_host,
+        dns_ttl=settings.http_dns_cache_ttl_seconds,
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+    )
+    timeout = SCRAPER_API_TIMEOUT_SECONDS if name == "scraper" else settings.http_timeout_seconds
+    return httpx.AsyncClient(transport=transport, follow_redirects=True, timeout=timeout)
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    """이름별 공용 httpx 클라이언트. 닫혔거나 없으면 새로 생성."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build_client(name)
+    return client
+
+
+def get_curl_session(impersonate: str):
+    """impersonate(예: 'chrome', 'safari15_5')별 curl_cffi AsyncSession 재사용."""
+    session = _curl_sessions.get(impersonate)
+    if session is None:
+        from curl_cffi.requests import AsyncSession as CurlAsyncSession
+        session = _curl_sessions[impersonate] = CurlAsyncSession(impersonate=impersonate)
+    return session
+
+
+async def init_http_clients() -> None:
+    """앱 시작 시 기본 클라이언트 생성."""
+    for name in ("default", "scraper"):
+        get_http_client(name)
+    logger.info("HTTP clients ready (http2=%s)", _http2_available())
+
+
+async def close_http_clients() -> None:
+    """앱 종료 시 모든 클라이언트/세션 정리."""
+    for name, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("HTTP client %s close failed: %s", name, e)
+    _clients.clear()
+    for impersonate, session in list(_curl_sessions.items()):
+        try:
+            await session.close()
+        except Exception as e:
+            logger.warning("curl_cffi session %s close failed: %s", impersonate, e)
+    _curl_sessions.clear()
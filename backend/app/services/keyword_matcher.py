@@ -0,0 +1,98 @@
+"""
+특가 키워드 매칭: 항공사별(항공사 전용 + 공통) 키워드를 한 번 컴파일해 프로세스 메모리에 캐시.
+- pyahocorasick 설치 시 Aho-Corasick 오토마톤, 없으면 정규식 하나(모든 위치에서 최장 키워드 + 포함 관계 표)
+- 본문을 한 번만 훑어 맞은 키워드 목록 반환
+- 키워드 추가/삭제 시 invalidate_keywords() (app/api/keywords.py)
+"""
+import importlib.util
+import logging
+import re
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.db_models import Keyword
+
+logger = logging.getLogger(__name__)
+
+_HAS_AHOCORASICK = importlib.util.find_spec("ahocorasick") is not None
+
+
+class KeywordMatcher:
+    """키워드 목록을 컴파일한 매처. 대소문자 무시."""
+
+    def __init__(self, keywords: list[str]) -> None:
+        # 소문자 키워드 -> 원래 표기 (처음 나온 것)
+        self._keywords: dict[str, str] = {}
+        for kw in keywords:
+            k = (kw or "").strip()
+            if k and k.lower() not in self._keywords:
+                self._keywords[k.lower()] = k
+        self._automaton = None
+        self._pattern: re.Pattern | None = None
+        self._contained: dict[str, list[str]] = {}
+        if not self._keywords:
+            return
+        if _HAS_AHOCORASICK:
+            import ahocorasick
+
+            automaton = ahocorasick.Automaton()
+            for k in self._keywords:
+                automaton.add_word(k, k)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # 위치마다 가장 긴 키워드 하나만 잡히므로, 그 안에 들어 있는 짧은 키워드는 포함 관계 표로 보충
+            ordered = sorted(self._keywords, key=len, reverse=True)
+            self._pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))")
+            self._contained = {k: [o for o in ordered if o != k and o in k] for k in ordered}
+
+    def __bool__(self) -> bool:
+        return bool(self._keywords)
+
+    def find(self, text: str) -> list[str]:
+        """text 에 들어 있는 키워드(원래 표기), 처음 등장한 순서."""
+        if not self._keywords or not text:
+            return []
+        lowered = text.lower()
+        hits: dict[str, None] = {}
+        if self._automaton is not None:
+            for _, k in self._automaton.iter(lowered):
+                hits.setdefault(k)
+        else:
+            for m in self._pattern.finditer(lowered):
+                k = m.group(1)
+                hits.setdefault(k)
+                for inner in self._contained[k]:
+                    hits.setdefault(inner)
+        return [self._keywords[k] for k in hits]
+
+
+# airline_id -> 매처. _generation 은 invalidate 때마다 증가 (조회 중 무효화된 결과를 캐시하지 않도록)
+_matchers: dict[str, KeywordMatcher] = {}
+_generation = 0
+
+
+async def get_keyword_matcher(session: AsyncSession, airline_id: str) -> KeywordMatcher:
+    """항공사 전용 + 공통 키워드 매처. 캐시에 없을 때만 DB 조회."""
+    matcher = _matchers.get(airline_id)
+    if matcher is not None:
+        return matcher
+    generation = _generation
+    res = await session.execute(
+        select(Keyword.keyword).where((Keyword.airline_id == airline_id) | (Keyword.airline_id.is_(None)))
+    )
+    matcher = KeywordMatcher([r[0] for r in res.all()])
+    if generation == _generation:
+        _matchers[airline_id] = matcher
+    return matcher
+
+
+def invalidate_keywords(airline_id: str | None = None) -> None:
+    """항공사 하나의 매처 제거. airline_id 가 None(공통 키워드 변경)이면 전체 제거."""
+    global _generation
+    _generation += 1
+    if airline_id is None:
+        _matchers.clear()
+    else:
+        _matchers.pop(airline_id, None)
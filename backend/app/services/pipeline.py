@@ -1,45 +1,81 @@
 """
 파이프라인: 공지 감지 → 분석 → 앱 푸시(Deal 저장)
+감지와 분석을 동시에 실행: 감지가 URL 하나를 커밋할 때마다 새 공지 id 를 bounded queue 에 넣고,
+분석 워커(analysis_concurrency 개)가 꺼내 바로 분석·푸시.
 """
+import asyncio
 import logging
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db import AsyncSessionLocal
 from app.models.db_models import Notice
+from app.services import response_cache
 from app.services.crawler import run_notice_detection
 from app.services.analyzer import analyze_notice, push_notice_to_deal
+from app.services.sync import prune_tombstones
 
 logger = logging.getLogger(__name__)
 
 
-async def run_pipeline():
-    """한 사이클: hash 감지 → 새 공지 분석 → 특가면 Deal 생성."""
+async def _analyze_and_push(notice_id: str) -> None:
+    """공지 하나 분석 → 특가면 Deal 생성. 자체 세션에서 커밋."""
     async with AsyncSessionLocal() as session:
         try:
-            new_notices = await run_notice_detection(session)
+            # 키워드 재분석 작업(app/services/reanalysis.py)과 겹치지 않도록 행 잠금, 이미 특가로 처리됐으면 건너뜀
+            notice = await session.get(Notice, notice_id, with_for_update=True)
+            if not notice or notice.is_special_deal:
+                return
+            ok = await analyze_notice(session, notice)
+            if ok:
+                await push_notice_to_deal(session, notice)
             await session.commit()
+            response_cache.bump_generation()
         except Exception as e:
             await session.rollback()
-            logger.exception("notice_detection failed: %s", e)
-            return
+            logger.exception("analyze/push failed for %s: %s", notice_id, e)
+
+
+async def _analysis_worker(queue: "asyncio.Queue[str | None]") -> None:
+    """queue 에서 공지 id 를 꺼내 분석. None 을 받으면 종료."""
+    while True:
+        notice_id = await queue.get()
+        try:
+            if notice_id is None:
+                return
+            await _analyze_and_push(notice_id)
+        finally:
+            queue.task_done()
 
-    for airline_id, airline_name, source_url, content_type, raw_content in new_notices:
+
+async def _prune_tombstones() -> None:
+    """보존 기간이 지난 삭제 tombstone 정리 (app/services/sync.py)."""
+    async with AsyncSessionLocal() as session:
+        try:
+            n = await prune_tombstones(session)
+            await session.commit()
+            if n:
+                logger.info("tombstone %d건 정리", n)
+        except Exception as e:
+            await session.rollback()
+            logger.exception("tombstone 정리 실패: %s", e)
+
+
+async def run_pipeline():
+    """한 사이클: hash 감지 → 새 공지 분석 → 특가면 Deal 생성 (감지와 분석이 겹쳐 진행)."""
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max(1, settings.analysis_queue_size))
+    n_workers = max(1, settings.analysis_concurrency)
+    workers = [asyncio.create_task(_analysis_worker(queue)) for _ in range(n_workers)]
+    try:
         async with AsyncSessionLocal() as session:
             try:
-                # 방금 생성된 공지 조회 (source_url + airline_id로)
-                q = select(Notice).where(
-                    Notice.airline_id == airline_id,
-                    Notice.source_url == source_url,
-                ).order_by(Notice.created_at.desc()).limit(1)
-                res = await session.execute(q)
-                notice = res.scalar_one_or_none()
-                if not notice:
-                    continue
-                ok = await analyze_notice(session, notice)
-                if ok:
-                    await push_notice_to_deal(session, notice)
+                await run_notice_detection(session, queue)
                 await session.commit()
             except Exception as e:
                 await session.rollback()
-                logger.exception("analyze/push failed for %s: %s", source_url, e)
+                logger.exception("notice_detection failed: %s", e)
+    finally:
+        # 이미 감지된 공지는 마저 분석한 뒤 워커 종료
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    await _prune_tombstones()
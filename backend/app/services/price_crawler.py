@@ -6,13 +6,11 @@ import logging
 import re
 from decimal import Decimal
 
-import httpx
-from bs4 import BeautifulSoup
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
 from app.models.db_models import Deal
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +25,9 @@ PRICE_PATTERNS = [
 async def fetch_price_from_url(url: str) -> Decimal | None:
     """URL 페이지에서 가격 숫자 추출 (첫 번째 매칭)."""
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=settings.http_timeout_seconds,
-        ) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            text = r.text
+        r = await get_http_client().get(url)
+        r.raise_for_status()
+        text = r.text
     except Exception as e:
         logger.warning("fetch_price_from_url failed %s: %s", url, e)
         return None
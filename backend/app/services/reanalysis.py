@@ -0,0 +1,158 @@
+"""
+키워드 추가 시 기존 공지 재분석 (백그라운드).
+- 새 키워드가 들어 있는 공지만 후보로 조회: coalesce(extracted_text, raw_content) ILIKE '%키워드%'
+  (pg_trgm 설치 시 ix_notices_text_trgm 트라이그램 인덱스 사용, 없으면 순차 조회)
+- 아직 특가가 아닌 텍스트 공지만, 항공사 전용 키워드면 해당 항공사 공지만
+- reanalysis_batch_size 건씩 analyze_notice → push_notice_to_deal → 커밋, 진행률은 get_jobs()/get_job()
+- 작업은 하나씩 순서대로 실행. 파이프라인과 같은 공지를 동시에 다루지 않도록 행 잠금(SKIP LOCKED),
+  잠겨 있어 건너뛴 공지는 마지막에 잠금을 기다려 다시 처리
+"""
+import asyncio
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.db_models import Notice, gen_uuid
+from app.services import response_cache
+from app.services.analyzer import analyze_notice, push_notice_to_deal
+
+logger = logging.getLogger(__name__)
+
+_MAX_FINISHED_JOBS = 20
+
+
+@dataclass
+class ReanalysisJob:
+    """재분석 작업 하나의 상태와 진행률."""
+    keyword: str
+    airline_id: str | None
+    id: str = field(default_factory=gen_uuid)
+    status: str = "queued"  # queued | running | done | failed
+    total: int = 0  # 후보 공지 수
+    processed: int = 0
+    new_deals: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+_jobs: dict[str, ReanalysisJob] = {}
+_tasks: set[asyncio.Task] = set()
+_run_lock = asyncio.Lock()
+
+
+def _candidate_filter(keyword: str, airline_id: str | None) -> list:
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    conds = [
+        Notice.is_special_deal.is_(False),
+        Notice.content_type == "text",
+        func.coalesce(Notice.extracted_text, Notice.raw_content).ilike(f"%{escaped}%", escape="\\"),
+    ]
+    if airline_id is not None:
+        conds.append(Notice.airline_id == airline_id)
+    return conds
+
+
+async def _lock_and_analyze(
+    session: AsyncSession,
+    job: ReanalysisJob,
+    ids: list[str],
+    conds: list,
+    skip_locked: bool,
+) -> list[Notice]:
+    """ids 중 아직 후보인 공지를 잠그고 분석 → 특가면 푸시 → 커밋. 잠가서 처리한 공지 목록 반환."""
+    res = await session.execute(
+        select(Notice).where(Notice.id.in_(ids), *conds).order_by(Notice.id).with_for_update(skip_locked=skip_locked)
+    )
+    notices = res.scalars().all()
+    for notice in notices:
+        if await analyze_notice(session, notice):
+            await push_notice_to_deal(session, notice)
+            job.new_deals += 1
+    await session.commit()
+    if notices:
+        response_cache.bump_generation()
+    job.processed += len(notices)
+    return notices
+
+
+async def _run(job: ReanalysisJob) -> None:
+    async with _run_lock:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        conds = _candidate_filter(job.keyword, job.airline_id)
+        try:
+            async with AsyncSessionLocal() as session:
+                job.total = (await session.execute(select(func.count()).select_from(Notice).where(*conds))).scalar() or 0
+            last_id = ""
+            batch_size = max(1, settings.reanalysis_batch_size)
+            # 다른 쪽이 잠그고 있어 건너뛴 공지. 끝에서 잠금을 기다려 다시 처리
+            skipped: list[str] = []
+            while True:
+                async with AsyncSessionLocal() as session:
+                    # id 순 keyset 으로 다음 묶음을 고르고, 잠글 수 있는 행만 잠가(SKIP LOCKED) 분석
+                    ids = (await session.execute(
+                        select(Notice.id).where(*conds, Notice.id > last_id).order_by(Notice.id).limit(batch_size)
+                    )).scalars().all()
+                    if not ids:
+                        break
+                    last_id = ids[-1]
+                    notices = await _lock_and_analyze(session, job, ids, conds, skip_locked=True)
+                    locked = {n.id for n in notices}
+                    skipped.extend(i for i in ids if i not in locked)
+            for start in range(0, len(skipped), batch_size):
+                async with AsyncSessionLocal() as session:
+                    # 조건을 다시 확인하므로 그 사이 특가가 된 공지는 빠짐
+                    await _lock_and_analyze(session, job, skipped[start:start + batch_size], conds, skip_locked=False)
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.exception("키워드 재분석 실패 (%s): %s", job.keyword, e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            logger.info(
+                "키워드 재분석 %s '%s': 후보 %d건, 처리 %d건, 새 특가 %d건",
+                job.status, job.keyword, job.total, job.processed, job.new_deals,
+            )
+
+
+def _prune() -> None:
+    finished = [j for j in _jobs.values() if j.finished_at is not None]
+    finished.sort(key=lambda j: j.finished_at)
+    for j in finished[:-_MAX_FINISHED_JOBS]:
+        _jobs.pop(j.id, None)
+
+
+def start_reanalysis(keyword: str, airline_id: str | None) -> ReanalysisJob:
+    """키워드 하나에 대한 재분석 작업을 백그라운드로 예약. 키워드가 커밋된 뒤 호출."""
+    _prune()
+    job = ReanalysisJob(keyword=keyword.strip(), airline_id=airline_id)
+    _jobs[job.id] = job
+    if not job.keyword:
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        return job
+    task = asyncio.create_task(_run(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get_jobs() -> list[dict]:
+    """최근 작업 목록 (최신 먼저)."""
+    return [j.as_dict() for j in sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)]
+
+
+def get_job(job_id: str) -> dict | None:
+    job = _jobs.get(job_id)
+    return job.as_dict() if job else None
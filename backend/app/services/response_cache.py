@@ -0,0 +1,66 @@
+"""
+목록 API 응답 캐시 (/api/deals, /api/notices)
+- 공지·특가 데이터가 바뀌는 곳(파이프라인, 키워드 재분석, 특가 토글, 데이터 삭제, 항공사 변경, 가격 갱신)이
+  커밋 후 bump_generation() 을 호출 → 이전 세대의 캐시는 모두 무효
+- 키는 경로 + 쿼리 파라미터. 값은 직렬화된 본문·ETag·헤더
+- "진행 중" 필터처럼 현재 시각에 따라 결과가 달라지는 경우를 위해 api_cache_ttl_seconds 가 지나면 다시 조회
+  (본문이 같으면 ETag 도 같으므로 클라이언트는 계속 304)
+- 프로세스 안에서만 유지 (파이프라인·스케줄러가 API 와 같은 프로세스에서 실행됨)
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str  # 따옴표 포함 강한 ETag
+    headers: dict[str, str]
+    generation: int
+    stored_at: float
+
+
+_generation = 0
+_entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+
+
+def current_generation() -> int:
+    return _generation
+
+
+def bump_generation() -> None:
+    """공지·특가 데이터가 바뀜 (커밋 후 호출). 캐시 전체 무효."""
+    global _generation
+    _generation += 1
+    _entries.clear()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def get(key: tuple) -> CachedResponse | None:
+    """현재 세대이고 TTL 안이면 캐시된 응답."""
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    if entry.generation != _generation or time.monotonic() - entry.stored_at > settings.api_cache_ttl_seconds:
+        _entries.pop(key, None)
+        return None
+    _entries.move_to_end(key)
+    return entry
+
+
+def put(key: tuple, body: bytes, headers: dict[str, str], generation: int) -> CachedResponse:
+    """generation 은 조회를 시작할 때의 current_generation(). 조회 중 데이터가 바뀌었으면 저장하지 않음."""
+    entry = CachedResponse(body, make_etag(body), headers, generation, time.monotonic())
+    if generation == _generation and settings.api_cache_entries > 0:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > settings.api_cache_entries:
+            _entries.popitem(last=False)
+    return entry
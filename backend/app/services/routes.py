@@ -0,0 +1,139 @@
+"""
+노선 추출: app/services/airports.py 사전(IATA 코드, 한국어·영어 도시명)을 정규식 하나로 컴파일해 본문을 한 번만 훑음.
+- "김포-제주", "인천 → 다낭", "인천발 오사카행", "ICN-CJU", "인천/부산 - 오사카"(출발지 여러 곳) 형태를 인식
+- 결과는 "GMP-CJU" 처럼 IATA 코드 "출발-도착" 목록 (Notice.routes / Deal.routes)
+- 한국어 이름은 앞뒤가 한글이면 무시 ("제주항공", "에어부산", "세부사항" 등 오인 방지). 단 발/행/에서/공항 등은 허용
+- 일상어와 같은 이름(AMBIGUOUS_KO_NAMES)과 영문 대문자 3글자 코드는 연결 기호(-, →, ~ 등) 바로 옆이거나
+  괄호 안("서울(ICN)")일 때만 지명으로 보고, 나열("인천/세부")로는 잇지 않음 ("YOU CAN - SEA" 같은 영어 단어도 제외)
+"""
+import re
+from functools import lru_cache
+
+from app.services.airports import AIRPORTS, AMBIGUOUS_KO_NAMES
+
+MAX_ROUTES = 20
+
+# 한국어 이름 뒤에 붙어도 되는 말 (이 외의 한글이 이어지면 지명이 아닌 것으로 봄)
+_KO_ALLOWED_SUFFIX = r"발|행|에서|으로|로|부터|까지|노선|편|공항|국제공항"
+
+# 같은 쪽(출발 또는 도착) 지명 나열: "인천/부산", "오사카, 도쿄"
+_LIST_GAP = re.compile(r"\s*(?:[/,·・&]|및)\s*")
+# 지명 뒤 괄호 속 코드: "서울(ICN)"
+_ALIAS_OPEN = re.compile(r"\s*\(\s*")
+_ALIAS_CLOSE = re.compile(r"\s*\)")
+# 출발 → 도착 연결: "-", "~", "→", "↔", "발", "에서", "출발" 중 하나는 있어야 함 (+ 공항 접미사)
+_ARROW = r"(?:[-~–—→↔⇄⟷>]+|<->)"
+_ROUTE_GAP = re.compile(rf"\s*(?:(?:국제)?공항)?\s*(?:(?:발|에서|출발)\s*{_ARROW}?|{_ARROW})\s*")
+# 모호한 지명·코드 판정용: 바로 뒤/앞의 연결 기호, 괄호, 앞에 붙은 영어 단어 ("YOU CAN")
+_ARROW_AFTER = re.compile(rf"(?:(?:국제)?공항)?\s*{_ARROW}")
+_ARROW_BEFORE = re.compile(rf"{_ARROW}\s*$")
+_PAREN_BEFORE = re.compile(r"\(\s*$")
+_LATIN_WORD_BEFORE = re.compile(r"[A-Za-z]\s+$")
+_LOOKBEHIND = 12
+
+
+def _en_key(name: str) -> str:
+    return "".join(name.lower().split())
+
+
+@lru_cache(maxsize=1)
+def _matcher() -> tuple[re.Pattern, dict[str, str], dict[str, str], frozenset[str]]:
+    """(컴파일된 정규식, 한국어 이름→코드, 영어 이름(소문자, 공백 제거)→코드, 코드 집합)."""
+    ko: dict[str, str] = {}
+    en: dict[str, str] = {}
+    en_names_all: set[str] = set()
+    codes = set()
+    for code, ko_names, en_names in AIRPORTS:
+        codes.add(code)
+        for n in ko_names:
+            ko.setdefault(n, code)
+        for n in en_names:
+            en.setdefault(_en_key(n), code)
+            en_names_all.add(n)
+
+    def alternation(names) -> str:
+        # 영어 이름의 공백은 없거나 여러 칸이어도 매칭 ("Da Nang", "DaNang")
+        return "|".join(re.escape(n).replace(r"\ ", r"\s*") for n in sorted(names, key=len, reverse=True))
+
+    pattern = re.compile(
+        rf"(?<![가-힣])(?P<ko>{alternation(ko)})(?=$|[^가-힣]|{_KO_ALLOWED_SUFFIX})"
+        rf"|(?<![A-Za-z])(?P<iata>{alternation(codes)})(?![A-Za-z])"
+        rf"|(?i:\b(?P<en>{alternation(en_names_all)})\b)"
+    )
+    return pattern, ko, en, frozenset(codes)
+
+
+def _anchored(text: str, start: int, end: int, is_code: bool) -> bool:
+    """모호한 지명/코드가 노선 표기 안에 있는지: 연결 기호 바로 옆, 또는 (코드면) 괄호 안."""
+    before = text[max(0, start - _LOOKBEHIND):start]
+    if _ARROW_BEFORE.search(before):
+        return True
+    if _ARROW_AFTER.match(text, end):
+        # 출발지 코드 앞에 영어 단어가 붙어 있으면 문장 속 단어 ("YOU CAN - SEA")
+        return not (is_code and _LATIN_WORD_BEFORE.search(before))
+    return is_code and _PAREN_BEFORE.search(before) is not None and _ALIAS_CLOSE.match(text, end) is not None
+
+
+def _places(text: str) -> list[tuple[int, int, str, bool]]:
+    """본문의 지명 (시작, 끝, IATA 코드, 모호한 이름/코드 여부), 위치 순. 노선 표기 밖의 모호한 것은 제외."""
+    pattern, ko, en, _ = _matcher()
+    found: list[tuple[int, int, str, bool]] = []
+    for m in pattern.finditer(text):
+        if m.group("ko"):
+            code = ko[m.group("ko")]
+            strict = m.group("ko") in AMBIGUOUS_KO_NAMES
+        elif m.group("iata"):
+            code = m.group("iata")
+            strict = True
+        else:
+            code = en[_en_key(m.group("en"))]
+            strict = False
+        if strict and not _anchored(text, m.start(), m.end(), m.group("iata") is not None):
+            continue
+        found.append((m.start(), m.end(), code, strict))
+    return found
+
+
+def extract_routes(text: str) -> list[str]:
+    """본문의 노선 목록 ["ICN-KIX", ...] (등장 순, 중복 제거, 최대 MAX_ROUTES개)."""
+    if not text:
+        return []
+    places = _places(text)
+
+    def route_gap_after(i: int) -> bool:
+        return i + 1 < len(places) and _ROUTE_GAP.fullmatch(text, places[i][1], places[i + 1][0]) is not None
+
+    # 나열된 지명끼리 한 묶음으로: [[코드...], 묶음 시작, 묶음 끝, 도착지 여부]
+    groups: list[list] = []
+    for i, (start, end, code, strict) in enumerate(places):
+        prev = groups[-1] if groups else None
+        alias = prev and _ALIAS_OPEN.fullmatch(text, prev[2], start) and _ALIAS_CLOSE.match(text, end)
+        if alias:
+            # "서울(ICN)", "인천(ICN)": 괄호 안 코드가 더 구체적이므로 앞 지명을 대체
+            close = _ALIAS_CLOSE.match(text, end)
+            prev[0][-1] = code
+            prev[2] = close.end()
+            continue
+        # "A - B / C - D" 의 B/C 는 나열이 아니라 노선 두 개: 도착 묶음 뒤 지명이 다시 출발지면 새 묶음
+        if (
+            prev and not strict
+            and _LIST_GAP.fullmatch(text, prev[2], start) and not (prev[3] and route_gap_after(i))
+        ):
+            if code not in prev[0]:
+                prev[0].append(code)
+            prev[2] = end
+        else:
+            is_dest = prev is not None and _ROUTE_GAP.fullmatch(text, prev[2], start) is not None
+            groups.append([[code], start, end, is_dest])
+
+    routes: dict[str, None] = {}
+    for (origins, _, o_end, _), (dests, d_start, _, _) in zip(groups, groups[1:]):
+        gap = text[o_end:d_start]
+        # 연결 표시(기호 또는 발/에서/출발)가 있어야 노선으로 봄 ("인천 오사카 도쿄 취항" 같은 나열은 제외)
+        if not _ROUTE_GAP.fullmatch(gap):
+            continue
+        for o in origins:
+            for d in dests:
+                if o != d:
+                    routes.setdefault(f"{o}-{d}")
+    return list(routes)[:MAX_ROUTES]
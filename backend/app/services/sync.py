@@ -0,0 +1,105 @@
+"""
+변경 동기화 (GET /api/deals/changes, /api/notices/changes)
+- 커서 = 마지막으로 받은 변경의 (시각, id). 추가·수정은 updated_at, 삭제는 deletion_log.deleted_at
+  (둘 다 DB 트리거가 clock_timestamp 로 기록, migrations 6)
+- 상한 시각(horizon): 아직 진행 중인 다른 트랜잭션의 시작 시각 이전까지만 응답.
+  먼저 시작한 트랜잭션이 나중에 커밋돼도 그 변경의 시각은 horizon 이후이므로 다음 요청에서 받음
+- 한 페이지를 다 받으면 커서를 horizon 으로 옮김 (변경이 없어도 커서가 보존 기간 밖으로 밀려나지 않도록)
+- deletion_log 는 sync_tombstone_retention_days 뒤 정리. 그보다 오래된 커서는 SyncCursorExpired (전체 다시 받기)
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Select, delete, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.db_models import DeletionLog
+
+
+class SyncCursorExpired(Exception):
+    """커서가 tombstone 보존 기간보다 오래됨. 클라이언트는 목록 전체를 다시 받아야 함."""
+
+
+@dataclass
+class ChangePage:
+    rows: list  # 추가·수정된 행 (변경 순)
+    deleted: list[str]  # 삭제된 id
+    cursor: tuple[datetime, str]  # 다음 요청의 since
+    has_more: bool
+
+
+def _retention_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=settings.sync_tombstone_retention_days)
+
+
+async def _horizon(session: AsyncSession) -> datetime:
+    res = await session.execute(text(
+        "SELECT least(clock_timestamp(), coalesce(("
+        "  SELECT min(xact_start) FROM pg_stat_activity"
+        "  WHERE datname = current_database() AND pid <> pg_backend_pid()"
+        "    AND backend_type = 'client backend' AND xact_start IS NOT NULL"
+        "), 'infinity'::timestamptz))"
+    ))
+    return res.scalar_one()
+
+
+async def fetch_changes(
+    session: AsyncSession,
+    table_name: str,
+    stmt: Select,
+    ts_col,
+    id_col,
+    since: tuple[datetime, str] | None,
+    limit: int,
+) -> ChangePage:
+    """stmt(목록 응답에 필요한 컬럼 select) 에서 since 이후 변경된 행 + 삭제 tombstone 을 변경 순으로 limit 건.
+    since 가 없으면 처음부터 (현재 있는 행 전체, tombstone 없음)."""
+    if since is not None and since[0] < _retention_cutoff():
+        raise SyncCursorExpired()
+    horizon = await _horizon(session)
+    # id 는 "C" 정렬로 비교 (파이썬 문자열 비교와 같은 순서여야 행·tombstone 을 합쳐 정렬할 수 있음)
+    id_key = id_col.collate("C")
+    conds = [ts_col < horizon]
+    if since is not None:
+        conds.append(tuple_(ts_col, id_key) > tuple_(*since))
+    res = await session.execute(
+        stmt.add_columns(ts_col.label("sync_ts"), id_col.label("sync_id"))
+        .where(*conds)
+        .order_by(ts_col, id_key)
+        .limit(limit + 1)
+    )
+    # (시각, id, 행 또는 None=삭제)
+    merged = [(r.sync_ts, r.sync_id, r) for r in res.all()]
+    if since is not None:
+        row_key = DeletionLog.row_id.collate("C")
+        res = await session.execute(
+            select(DeletionLog.deleted_at, DeletionLog.row_id)
+            .where(
+                DeletionLog.table_name == table_name,
+                DeletionLog.deleted_at < horizon,
+                tuple_(DeletionLog.deleted_at, row_key) > tuple_(*since),
+            )
+            .order_by(DeletionLog.deleted_at, row_key)
+            .limit(limit + 1)
+        )
+        merged += [(ts, row_id, None) for ts, row_id in res.all()]
+        merged.sort(key=lambda m: (m[0], m[1]))
+    has_more = len(merged) > limit
+    page = merged[:limit]
+    if has_more:
+        cursor = (page[-1][0], page[-1][1])
+    else:
+        cursor = max((horizon, ""), since) if since is not None else (horizon, "")
+    return ChangePage(
+        rows=[m[2] for m in page if m[2] is not None],
+        deleted=[m[1] for m in page if m[2] is None],
+        cursor=cursor,
+        has_more=has_more,
+    )
+
+
+async def prune_tombstones(session: AsyncSession) -> int:
+    """보존 기간이 지난 tombstone 삭제. 삭제한 건수."""
+    res = await session.execute(delete(DeletionLog).where(DeletionLog.deleted_at < _retention_cutoff()))
+    return res.rowcount or 0